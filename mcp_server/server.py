@@ -365,6 +365,10 @@ def create_github_pr_mcp_server(
                             "description": "Use fast pattern matching (~5sec) instead of LLM analysis (~60sec). Ask user before calling.",
                             "default": False,
                         },
+                        "include_context": {
+                            "type": "boolean",
+                            "description": "Fetch code context for each comment (default: true, or false in fast mode)",
+                        },
                     },
                     "required": ["pr_number"],
                 },
@@ -449,6 +453,10 @@ def create_github_pr_mcp_server(
                             "type": "boolean",
                             "description": "Whether to resolve threads after posting (default: True)",
                         },
+                        "max_failures": {
+                            "type": "integer",
+                            "description": "Stop after this many failures and skip remaining comments (default: no limit)",
+                        },
                     },
                     "required": ["pr_number"],
                 },
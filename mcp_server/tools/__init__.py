@@ -15,7 +15,11 @@ from .code_ops import (
     get_pr_diff,
     resolve_thread,
 )
-from .comments import fetch_pr_comments, get_comment_context
+from .comments import (
+    fetch_all_comment_contexts,
+    fetch_pr_comments,
+    get_comment_context,
+)
 from .smart_analysis import (
     analyze_comment_smart,
     get_bot_comment_filters,
@@ -25,11 +29,13 @@ from .interactive import (
     prepare_comment_decisions,
     execute_comment_decision,
     bulk_close_comments,
+    bulk_close_comments_stream,
 )
 
 __all__ = [
     "fetch_pr_comments",
     "get_comment_context",
+    "fetch_all_comment_contexts",
     "analyze_comment_validity",
     "batch_analyze_comments",
     "apply_code_fix",
@@ -44,4 +50,5 @@ __all__ = [
     "prepare_comment_decisions",
     "execute_comment_decision",
     "bulk_close_comments",
+    "bulk_close_comments_stream",
 ]
@@ -4,6 +4,7 @@ Comment analysis tools
 Provides MCP tools for analyzing comment validity and batch processing.
 """
 
+import asyncio
 from collections import defaultdict
 from typing import Any
 
@@ -13,7 +14,7 @@ from ..models import (
     ValidityAnalysis,
     ValidityStatus,
 )
-from .comments import get_comment_context
+from .comments import format_snippet, get_comment_context
 from .github_api import get_github_client
 
 
@@ -57,8 +58,8 @@ async def analyze_comment_validity(
     # Get GitHub client
     client = get_github_client(repo=repo)
 
-    # Find the comment
-    comments = client.get_all_pr_comments(pr_number)
+    # Find the comment (in a worker thread so concurrent analyses overlap)
+    comments = await asyncio.to_thread(client.get_all_pr_comments, pr_number)
     comment = next((c for c in comments if c.id == comment_id), None)
 
     if not comment:
@@ -85,6 +86,80 @@ async def analyze_comment_validity(
     return result.model_dump(mode="json")
 
 
+async def analyze_comments_validity_batch(
+    comments: list[dict[str, Any]],
+    pr_number: int,
+    repo: str | None,
+    lines_before: int = 10,
+    lines_after: int = 10,
+) -> list[dict[str, Any]]:
+    """
+    Analyze several comments in one pass
+
+    Same analysis as analyze_comment_validity, but the PR and each
+    commented file are fetched once for the whole batch instead of
+    re-fetching every PR comment and file per comment.
+
+    Args:
+        comments: Comment dicts as returned by fetch_pr_comments
+        pr_number: PR number
+        repo: Repository in format "owner/repo" (None to auto-detect)
+        lines_before: Context lines before the commented line
+        lines_after: Context lines after the commented line
+
+    Returns:
+        List of analysis dicts (see analyze_comment_validity), one per
+        comment, in input order
+    """
+    client = get_github_client(repo=repo)
+    pr = await asyncio.to_thread(client.get_pull_request, pr_number)
+
+    # Fetch each commented file once, concurrently
+    paths = list(
+        {c["file_path"] for c in comments if c.get("file_path") and c.get("line_number")}
+    )
+    contents = await asyncio.gather(
+        *[
+            asyncio.to_thread(client.get_file_content, path, ref=pr.head.ref)
+            for path in paths
+        ],
+        return_exceptions=True,
+    )
+    files = dict(zip(paths, contents, strict=True))
+
+    results = []
+    for comment in comments:
+        file_path = comment.get("file_path")
+        line_number = comment.get("line_number")
+
+        if not file_path or not line_number:
+            code_snippet = comment["body"]
+        elif isinstance(files[file_path], Exception):
+            code_snippet = (
+                f"Error fetching file content: {files[file_path]}\n\n"
+                f"Diff hunk:\n{comment.get('diff_hunk') or 'Not available'}"
+            )
+        else:
+            code_snippet = format_snippet(
+                files[file_path].split("\n"), line_number, lines_before, lines_after
+            )
+
+        analysis = _heuristic_analysis(comment["body"], code_snippet)
+
+        results.append(
+            ValidityAnalysis(
+                comment_id=comment["id"],
+                is_valid=analysis["is_valid"],
+                status=analysis["status"],
+                confidence=analysis["confidence"],
+                reasoning=analysis["reasoning"],
+                suggested_action=analysis["suggested_action"],
+            ).model_dump(mode="json")
+        )
+
+    return results
+
+
 def _heuristic_analysis(
     comment_body: str, code_snippet: str
 ) -> dict[str, Any]:
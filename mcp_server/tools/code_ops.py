@@ -4,6 +4,7 @@ Code operations tools
 Provides MCP tools for applying code fixes and managing git operations.
 """
 
+import asyncio
 import os
 from pathlib import Path
 from typing import Any
@@ -193,7 +194,10 @@ async def create_comment_reply(
         ... )
     """
     client = get_github_client(repo=repo)
-    return client.create_comment_reply(comment_id, pr_number, message)
+    # Blocking API call runs in a worker thread so bulk callers can overlap replies
+    return await asyncio.to_thread(
+        client.create_comment_reply, comment_id, pr_number, message
+    )
 
 
 async def resolve_thread(
@@ -229,7 +233,7 @@ async def resolve_thread(
         Current implementation is a placeholder.
     """
     client = get_github_client(repo=repo)
-    result = client.resolve_thread(comment_id, pr_number)
+    result = await asyncio.to_thread(client.resolve_thread, comment_id, pr_number)
 
     if reason:
         result["reason"] = reason
@@ -5,6 +5,7 @@ Provides MCP tools for fetching and filtering PR comments,
 and getting code context around comments.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -16,6 +17,7 @@ async def fetch_pr_comments(
     pr_number: int,
     repo: str,
     filters: dict[str, Any] | None = None,
+    fields: list[str] | None = None,
 ) -> list[dict[str, Any]]:
     """
     Fetch PR comments with intelligent filtering
@@ -32,6 +34,9 @@ async def fetch_pr_comments(
             - types: List of comment types to include
             - keywords: List of keywords to search for in comment body
             - min_age_days: Only include comments older than N days
+        fields: Optional list of keys to include in each comment dict
+            (default: all fields). This only trims the returned payload;
+            every comment is still fetched and status-checked in full.
 
     Returns:
         List of comment dictionaries with full details
@@ -59,8 +64,12 @@ async def fetch_pr_comments(
     # Apply filters
     filtered_comments = _apply_filters(all_comments, filter_obj)
 
-    # Convert to dict for JSON serialization
-    return [comment.model_dump(mode="json") for comment in filtered_comments]
+    # Convert to dict for JSON serialization, serializing only requested fields
+    include = set(fields) if fields else None
+    return [
+        comment.model_dump(mode="json", include=include)
+        for comment in filtered_comments
+    ]
 
 
 def _apply_filters(
@@ -149,8 +158,9 @@ async def get_comment_context(
     # Get GitHub client
     client = get_github_client(repo=repo)
 
-    # Find the comment
-    comments = client.get_all_pr_comments(pr_number)
+    # Find the comment (blocking API calls run in a worker thread so
+    # concurrent callers can overlap their round-trips)
+    comments = await asyncio.to_thread(client.get_all_pr_comments, pr_number)
     comment = next((c for c in comments if c.id == comment_id), None)
 
     if not comment:
@@ -171,28 +181,18 @@ async def get_comment_context(
     # Get file content
     try:
         # Get PR to find the head ref
-        pr = client.get_pull_request(pr_number)
-        file_content = client.get_file_content(
-            comment.file_path, ref=pr.head.ref
+        pr = await asyncio.to_thread(client.get_pull_request, pr_number)
+        file_content = await asyncio.to_thread(
+            client.get_file_content, comment.file_path, ref=pr.head.ref
         )
 
         # Extract code snippet with context
-        lines = file_content.split("\n")
-        line_idx = comment.line_number - 1  # Convert to 0-based index
-
-        start_idx = max(0, line_idx - lines_before)
-        end_idx = min(len(lines), line_idx + lines_after + 1)
-
-        snippet_lines = []
-        for i in range(start_idx, end_idx):
-            # Add line numbers
-            marker = ">>>" if i == line_idx else "   "
-            snippet_lines.append(f"{marker} {i+1:4d} | {lines[i]}")
-
-        code_snippet = "\n".join(snippet_lines)
+        code_snippet = format_snippet(
+            file_content.split("\n"), comment.line_number, lines_before, lines_after
+        )
 
         # Get related changes (other files modified in PR)
-        pr_files = client.get_pr_files(pr_number)
+        pr_files = await asyncio.to_thread(client.get_pr_files, pr_number)
         related_changes = [
             f"{f['filename']} (+{f['additions']}/-{f['deletions']})"
             for f in pr_files
@@ -225,3 +225,125 @@ async def get_comment_context(
         )
 
         return context.model_dump(mode="json")
+
+
+async def fetch_all_comment_contexts(
+    pr_number: int,
+    repo: str | None,
+    lines_before: int = 10,
+    lines_after: int = 10,
+) -> dict[str, dict[str, Any]]:
+    """
+    Get code context for every comment in a PR at once
+
+    Same result as calling get_comment_context per comment, but the
+    comments, PR files and all commented file contents are each fetched
+    once (file contents in a single GraphQL query) instead of per comment.
+
+    Args:
+        pr_number: PR number
+        repo: Repository in format "owner/repo" (None to auto-detect)
+        lines_before: Number of lines to include before the comment line
+        lines_after: Number of lines to include after the comment line
+
+    Returns:
+        Mapping of comment ID to context dict (see get_comment_context)
+
+    Example:
+        >>> contexts = await fetch_all_comment_contexts(pr_number=69, repo="MarkEnverus/my-repo")
+        >>> print(contexts["123456"]["code_snippet"])
+    """
+    client = get_github_client(repo=repo)
+
+    comments, pr, pr_files = await asyncio.gather(
+        asyncio.to_thread(client.get_all_pr_comments, pr_number),
+        asyncio.to_thread(client.get_pull_request, pr_number),
+        asyncio.to_thread(client.get_pr_files, pr_number),
+    )
+
+    paths = list({c.file_path for c in comments if c.file_path and c.line_number})
+    try:
+        files = await asyncio.to_thread(client.get_files_content, paths, pr.head.ref)
+        files_error = None
+    except Exception as e:
+        files, files_error = {}, e
+
+    contexts = {}
+    for comment in comments:
+        content = files.get(comment.file_path) if comment.file_path else None
+        if not comment.file_path or not comment.line_number:
+            # Comment is not associated with a specific line
+            context = CommentContext(
+                comment_id=comment.id,
+                file_path="",
+                line_number=0,
+                code_snippet=comment.body,
+                lines_before=0,
+                lines_after=0,
+                diff_hunk=comment.diff_hunk,
+            )
+        elif content is None:
+            # Fallback to just showing diff hunk
+            error = files_error or f"{comment.file_path} not found at {pr.head.ref}"
+            context = CommentContext(
+                comment_id=comment.id,
+                file_path=comment.file_path,
+                line_number=comment.line_number,
+                code_snippet=f"Error fetching file content: {error}\n\nDiff hunk:\n{comment.diff_hunk or 'Not available'}",
+                lines_before=0,
+                lines_after=0,
+                diff_hunk=comment.diff_hunk,
+            )
+        else:
+            context = CommentContext(
+                comment_id=comment.id,
+                file_path=comment.file_path,
+                line_number=comment.line_number,
+                code_snippet=format_snippet(
+                    content.split("\n"),
+                    comment.line_number,
+                    lines_before,
+                    lines_after,
+                ),
+                lines_before=lines_before,
+                lines_after=lines_after,
+                diff_hunk=comment.diff_hunk,
+                related_changes=[
+                    f"{f['filename']} (+{f['additions']}/-{f['deletions']})"
+                    for f in pr_files
+                    if f["filename"] != comment.file_path
+                ],
+            )
+
+        contexts[comment.id] = context.model_dump(mode="json")
+
+    return contexts
+
+
+def format_snippet(
+    lines: list[str], line_number: int, lines_before: int, lines_after: int
+) -> str:
+    """
+    Format the lines around line_number with line numbers and a marker
+
+    Args:
+        lines: File content split into lines
+        line_number: 1-based line the comment is attached to
+        lines_before: Number of lines to include before
+        lines_after: Number of lines to include after
+
+    Returns:
+        Numbered code snippet with ">>>" on the commented line
+    """
+    line_idx = line_number - 1  # Convert to 0-based index
+
+    start_idx = max(0, line_idx - lines_before)
+    end_idx = min(len(lines), line_idx + lines_after + 1)
+
+    snippet_lines = []
+    for i in range(start_idx, end_idx):
+        # Add line numbers
+        marker = ">>>" if i == line_idx else "   "
+        snippet_lines.append(f"{marker} {i+1:4d} | {lines[i]}")
+
+    return "\n".join(snippet_lines)
@@ -4,12 +4,13 @@ GitHub API wrapper for PR comment operations
 Provides low-level GitHub API interactions using PyGithub and GraphQL.
 """
 
-import json
 import os
-import subprocess
+import threading
 from typing import Any
 
-from github import Auth, Github
+import httpx
+import orjson
+from github import Auth, Github, GithubRetry
 from github.IssueComment import IssueComment
 from github.PullRequest import PullRequest
 from github.PullRequestComment import PullRequestComment
@@ -22,6 +23,47 @@ from ..models import (
 )
 from ..utils.git_detector import get_repo_with_fallback
 
+# Maximum page size allowed by the GitHub REST and GraphQL APIs
+PAGE_SIZE = 100
+
+# Connections kept per host; covers the concurrency of the interactive tools
+# (analysis and bulk close run blocking calls in parallel worker threads)
+POOL_SIZE = 20
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# All review threads of a PR with the database IDs of their comments
+_REVIEW_THREADS_QUERY = f"""
+query($owner: String!, $name: String!, $number: Int!) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequest(number: $number) {{
+      reviewThreads(first: {PAGE_SIZE}) {{
+        nodes {{
+          id
+          isResolved
+          comments(first: {PAGE_SIZE}) {{
+            nodes {{
+              databaseId
+            }}
+          }}
+        }}
+      }}
+    }}
+  }}
+}}
+"""
+
+_RESOLVE_THREAD_MUTATION = """
+mutation($threadId: ID!) {
+  resolveReviewThread(input: {threadId: $threadId}) {
+    thread {
+      id
+      isResolved
+    }
+  }
+}
+"""
+
 
 class GitHubAPIClient:
     """
@@ -36,12 +78,13 @@ class GitHubAPIClient:
             token: GitHub personal access token
             repo: Repository in format "owner/repo"
         """
-        auth = Auth.Token(token)
-        self.client = Github(auth=auth)
+        self.client = _get_shared_github(token)
         self.repo_name = repo
+        self.owner, _, self._repo_short = repo.partition("/")
         self.token = token
         self._repo: Repository | None = None
         self._thread_status_cache: dict[str, CommentStatus] = {}  # Cache for thread statuses
+        self._comment_index: dict[int, dict[int, CommentType]] = {}  # PR -> comment id -> type
 
     @property
     def repo(self) -> Repository:
@@ -102,8 +145,32 @@ class GitHubAPIClient:
         for comment in issue_comments:
             comments.append(self._convert_issue_comment(comment, pr_number))
 
+        self._index_comments(pr_number, review_comments, issue_comments)
+
         return comments
 
+    def _index_comments(
+        self,
+        pr_number: int,
+        review_comments: list[PullRequestComment],
+        issue_comments: list[IssueComment],
+    ) -> dict[int, CommentType]:
+        """
+        Memoize comment id -> comment type for a PR
+
+        Args:
+            pr_number: PR number
+            review_comments: Review comments of the PR
+            issue_comments: Issue comments of the PR
+
+        Returns:
+            Mapping of comment id to comment type
+        """
+        index = {c.id: CommentType.ISSUE_COMMENT for c in issue_comments}
+        index.update({c.id: CommentType.REVIEW_COMMENT for c in review_comments})
+        self._comment_index[pr_number] = index
+        return index
+
     def _convert_review_comment(
         self, comment: PullRequestComment, pr_number: int
     ) -> PRComment:
@@ -161,51 +228,18 @@ class GitHubAPIClient:
 
         try:
             # Query GraphQL for thread status
-            # We need to find the thread that contains this comment
-            owner, repo_name = self.repo_name.split("/")
-            pr_number = comment.pull_request_url.split("/")[-1]
-
-            query = f"""
-            {{
-              repository(owner: "{owner}", name: "{repo_name}") {{
-                pullRequest(number: {pr_number}) {{
-                  reviewThreads(first: 100) {{
-                    nodes {{
-                      id
-                      isResolved
-                      comments(first: 100) {{
-                        nodes {{
-                          databaseId
-                        }}
-                      }}
-                    }}
-                  }}
-                }}
-              }}
-            }}
-            """
-
-            data = self._graphql_query(query)
-
-            # Find the thread containing this comment
-            threads = data.get("repository", {}).get("pullRequest", {}).get("reviewThreads", {}).get("nodes", [])
+            pr_number = int(comment.pull_request_url.rsplit("/", 1)[-1])
+            threads = self._get_review_threads(pr_number)
 
+            # One query returns every thread in the PR, so cache all of them
             for thread in threads:
-                comment_ids = [
-                    c["databaseId"]
-                    for c in thread.get("comments", {}).get("nodes", [])
-                ]
-                if comment.id in comment_ids:
-                    is_resolved = thread.get("isResolved", False)
-                    status = CommentStatus.RESOLVED if is_resolved else CommentStatus.OPEN
-
-                    # Cache the result
-                    self._thread_status_cache[comment_id] = status
-                    return status
+                is_resolved = thread.get("isResolved", False)
+                status = CommentStatus.RESOLVED if is_resolved else CommentStatus.OPEN
+                for c in thread.get("comments", {}).get("nodes", []):
+                    self._thread_status_cache[str(c["databaseId"])] = status
 
             # If thread not found, assume open
-            self._thread_status_cache[comment_id] = CommentStatus.OPEN
-            return CommentStatus.OPEN
+            return self._thread_status_cache.setdefault(comment_id, CommentStatus.OPEN)
 
         except Exception:
             # If GraphQL fails, fall back to OPEN
@@ -227,55 +261,52 @@ class GitHubAPIClient:
             Reply comment data with id, url, and body
 
         Raises:
-            ValueError: If comment not found
+            ValueError: If comment_id is not numeric or comment not found
             Exception: If API call fails
         """
-        pr = self.get_pull_request(pr_number)
-
-        # Try to find the comment among review comments
         try:
-            review_comments = list(pr.get_review_comments())
             comment_id_int = int(comment_id)
-
-            for comment in review_comments:
-                if comment.id == comment_id_int:
-                    # This is a review comment - create threaded reply
-                    reply = pr.create_review_comment_reply(
-                        comment_id=comment_id_int,
-                        body=body
-                    )
-
-                    return {
-                        "id": str(reply.id),
-                        "url": reply.html_url,
-                        "body": reply.body,
-                        "type": "review_comment_reply",
-                    }
-
         except ValueError:
-            pass  # comment_id not an integer, might be an issue comment
+            raise ValueError(f"Invalid comment_id: {comment_id}") from None
 
-        # Try issue comments
-        try:
-            issue_comments = list(pr.get_issue_comments())
-            comment_id_int = int(comment_id)
+        pr = self.get_pull_request(pr_number)
 
-            for comment in issue_comments:
-                if comment.id == comment_id_int:
-                    # This is an issue comment - create general PR comment
-                    # Issue comments don't have direct threading, so post a reference
-                    reply_body = f"> Replying to comment {comment_id}\n\n{body}"
-                    reply = pr.create_issue_comment(reply_body)
-
-                    return {
-                        "id": str(reply.id),
-                        "url": reply.html_url,
-                        "body": reply.body,
-                        "type": "issue_comment",
-                    }
+        # Look up the comment type, refreshing the index if it is unknown
+        comment_type = self._comment_index.get(pr_number, {}).get(comment_id_int)
+        if comment_type is None:
+            index = self._index_comments(
+                pr_number,
+                list(pr.get_review_comments()),
+                list(pr.get_issue_comments()),
+            )
+            comment_type = index.get(comment_id_int)
 
-        except ValueError:
-            pass
+        if comment_type == CommentType.REVIEW_COMMENT:
+            # This is a review comment - create threaded reply
+            reply = pr.create_review_comment_reply(
+                comment_id=comment_id_int,
+                body=body
+            )
+
+            return {
+                "id": str(reply.id),
+                "url": reply.html_url,
+                "body": reply.body,
+                "type": "review_comment_reply",
+            }
+
+        if comment_type == CommentType.ISSUE_COMMENT:
+            # This is an issue comment - create general PR comment
+            # Issue comments don't have direct threading, so post a reference
+            reply_body = f"> Replying to comment {comment_id}\n\n{body}"
+            reply = pr.create_issue_comment(reply_body)
+
+            return {
+                "id": str(reply.id),
+                "url": reply.html_url,
+                "body": reply.body,
+                "type": "issue_comment",
+            }
 
         # Comment not found
         raise ValueError(
@@ -301,53 +332,18 @@ class GitHubAPIClient:
             Exception: If GraphQL mutation fails
         """
         try:
-            # First, find the thread ID for this comment
-            owner, repo_name = self.repo_name.split("/")
-
-            query = f"""
-            {{
-              repository(owner: "{owner}", name: "{repo_name}") {{
-                pullRequest(number: {pr_number}) {{
-                  reviewThreads(first: 100) {{
-                    nodes {{
-                      id
-                      isResolved
-                      comments(first: 100) {{
-                        nodes {{
-                          databaseId
-                        }}
-                      }}
-                    }}
-                  }}
-                }}
-              }}
-            }}
-            """
-
-            data = self._graphql_query(query)
+            # First, find the thread containing this comment
+            threads = self._get_review_threads(pr_number)
+            thread = self._threads_by_comment(threads).get(int(comment_id))
 
-            # Find the thread containing this comment
-            threads = data.get("repository", {}).get("pullRequest", {}).get("reviewThreads", {}).get("nodes", [])
-
-            thread_id = None
-            already_resolved = False
-            comment_id_int = int(comment_id)
-
-            for thread in threads:
-                comment_ids = [
-                    c["databaseId"]
-                    for c in thread.get("comments", {}).get("nodes", [])
-                ]
-                if comment_id_int in comment_ids:
-                    thread_id = thread["id"]
-                    already_resolved = thread.get("isResolved", False)
-                    break
-
-            if not thread_id:
+            if thread is None:
                 raise ValueError(
                     f"No review thread found containing comment {comment_id} in PR {pr_number}"
                 )
 
+            thread_id = thread["id"]
+            already_resolved = thread.get("isResolved", False)
+
             if already_resolved:
                 # Already resolved, return success
                 return {
@@ -358,26 +354,16 @@ class GitHubAPIClient:
                 }
 
             # Resolve the thread using GraphQL mutation
-            mutation = f"""
-            mutation {{
-              resolveReviewThread(input: {{threadId: "{thread_id}"}}) {{
-                thread {{
-                  id
-                  isResolved
-                }}
-              }}
-            }}
-            """
-
-            result = self._graphql_mutation(mutation)
+            result = self._graphql_mutation(
+                _RESOLVE_THREAD_MUTATION, {"threadId": thread_id}
+            )
 
             # Extract result
             thread_data = result.get("resolveReviewThread", {}).get("thread", {})
             is_resolved = thread_data.get("isResolved", False)
 
-            # Clear cache for this comment
-            if comment_id in self._thread_status_cache:
-                del self._thread_status_cache[comment_id]
+            # Clear cache for every comment in this thread
+            self._clear_thread_status(thread)
 
             if is_resolved:
                 return {
@@ -395,6 +381,130 @@ class GitHubAPIClient:
         except Exception as e:
             raise Exception(f"Failed to resolve thread for comment {comment_id}: {e}") from e
 
+    def resolve_threads(
+        self, comment_ids: list[str], pr_number: int
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Resolve several comment threads with a single GraphQL mutation
+
+        Looks up all review threads with one query, then resolves every
+        open thread in one document of aliased resolveReviewThread mutations.
+
+        Args:
+            comment_ids: Comment IDs whose threads should be resolved
+            pr_number: PR number
+
+        Returns:
+            Mapping of comment_id to resolution status (same shape as
+            resolve_thread; status is "not_found" if no thread contains it)
+
+        Raises:
+            Exception: If the GraphQL query or mutation fails
+        """
+        try:
+            threads = self._get_review_threads(pr_number)
+
+            thread_by_comment = self._threads_by_comment(threads)
+
+            results: dict[str, dict[str, Any]] = {}
+            aliases: dict[str, str] = {}  # thread_id -> mutation alias
+            to_resolve: list[dict[str, Any]] = []
+            pending: dict[str, str] = {}  # comment_id -> thread_id
+
+            for comment_id in comment_ids:
+                thread = (
+                    thread_by_comment.get(int(comment_id))
+                    if comment_id.isdigit()
+                    else None
+                )
+
+                if thread is None:
+                    results[comment_id] = {
+                        "comment_id": comment_id,
+                        "thread_id": None,
+                        "status": "not_found",
+                        "is_resolved": False,
+                    }
+                elif thread.get("isResolved", False):
+                    results[comment_id] = {
+                        "comment_id": comment_id,
+                        "thread_id": thread["id"],
+                        "status": "already_resolved",
+                        "is_resolved": True,
+                    }
+                else:
+                    thread_id = thread["id"]
+                    if thread_id not in aliases:
+                        aliases[thread_id] = f"r{len(aliases)}"
+                        to_resolve.append(thread)
+                    pending[comment_id] = thread_id
+
+            if aliases:
+                params = ", ".join(f"${alias}: ID!" for alias in aliases.values())
+                fields = "\n".join(
+                    f"{alias}: resolveReviewThread(input: {{threadId: ${alias}}}) "
+                    "{ thread { id isResolved } }"
+                    for alias in aliases.values()
+                )
+                data = self._graphql_mutation(
+                    f"mutation({params}) {{\n{fields}\n}}",
+                    {alias: thread_id for thread_id, alias in aliases.items()},
+                )
+
+                for comment_id, thread_id in pending.items():
+                    thread_data = (data.get(aliases[thread_id]) or {}).get("thread") or {}
+                    is_resolved = thread_data.get("isResolved", False)
+                    results[comment_id] = {
+                        "comment_id": comment_id,
+                        "thread_id": thread_id,
+                        "status": "resolved" if is_resolved else "failed",
+                        "is_resolved": is_resolved,
+                    }
+
+            # Clear cache for all comments in the affected threads
+            for thread in to_resolve:
+                self._clear_thread_status(thread)
+
+            return results
+
+        except Exception as e:
+            raise Exception(f"Failed to resolve threads in PR {pr_number}: {e}") from e
+
+    def _get_review_threads(self, pr_number: int) -> list[dict[str, Any]]:
+        """
+        Get all review threads for a PR with their comment database IDs
+
+        Args:
+            pr_number: PR number
+
+        Returns:
+            List of thread nodes (id, isResolved, comments)
+        """
+        data = self._graphql_query(
+            _REVIEW_THREADS_QUERY,
+            {"owner": self.owner, "name": self._repo_short, "number": pr_number},
+        )
+        nodes: list[dict[str, Any]] = (
+            data.get("repository", {}).get("pullRequest", {}).get("reviewThreads", {}).get("nodes", [])
+        )
+        return nodes
+
+    @staticmethod
+    def _threads_by_comment(
+        threads: list[dict[str, Any]]
+    ) -> dict[int, dict[str, Any]]:
+        """Map each comment databaseId to the review thread containing it"""
+        return {
+            c["databaseId"]: thread
+            for thread in threads
+            for c in thread.get("comments", {}).get("nodes", [])
+        }
+
+    def _clear_thread_status(self, thread: dict[str, Any]) -> None:
+        """Drop cached statuses for every comment in a review thread"""
+        for c in thread.get("comments", {}).get("nodes", []):
+            self._thread_status_cache.pop(str(c["databaseId"]), None)
+
     def get_file_content(
         self, file_path: str, ref: str | None = None
     ) -> str:
@@ -417,6 +527,50 @@ class GitHubAPIClient:
         except Exception as e:
             raise Exception(f"Failed to get file content: {e}") from e
 
+    def get_files_content(
+        self, file_paths: list[str], ref: str
+    ) -> dict[str, str | None]:
+        """
+        Get the content of several files with a single GraphQL query
+
+        Each file is an aliased repository.object(expression: "ref:path")
+        field, so any number of files costs one round-trip.
+
+        Args:
+            file_paths: Paths to files in repo
+            ref: Git ref (branch, commit, tag)
+
+        Returns:
+            Mapping of file path to content (None if missing or not a text file)
+
+        Raises:
+            Exception: If the GraphQL query fails
+        """
+        if not file_paths:
+            return {}
+
+        aliases = {f"f{i}": path for i, path in enumerate(file_paths)}
+        params = ", ".join(f"${alias}: String!" for alias in aliases)
+        fields = "\n".join(
+            f"{alias}: object(expression: ${alias}) {{ ... on Blob {{ text }} }}"
+            for alias in aliases
+        )
+        data = self._graphql_query(
+            f"query($owner: String!, $name: String!, {params}) {{\n"
+            f"repository(owner: $owner, name: $name) {{\n{fields}\n}}\n}}",
+            {
+                "owner": self.owner,
+                "name": self._repo_short,
+                **{alias: f"{ref}:{path}" for alias, path in aliases.items()},
+            },
+        )
+
+        repository = data.get("repository") or {}
+        return {
+            path: (repository.get(alias) or {}).get("text")
+            for alias, path in aliases.items()
+        }
+
     def get_pr_diff(self, pr_number: int) -> str:
         """
         Get unified diff for entire PR
@@ -469,12 +623,15 @@ class GitHubAPIClient:
 
         return result
 
-    def _graphql_query(self, query: str) -> dict[str, Any]:
+    def _graphql_query(
+        self, query: str, variables: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """
-        Execute a GraphQL query using gh CLI
+        Execute a GraphQL query over the shared HTTP/2 client
 
         Args:
             query: GraphQL query string
+            variables: Values for the query's $variables
 
         Returns:
             Query response data
@@ -483,14 +640,17 @@ class GitHubAPIClient:
             Exception: If GraphQL query fails
         """
         try:
-            result = subprocess.run(
-                ["gh", "api", "graphql", "-f", f"query={query}"],
-                capture_output=True,
-                text=True,
-                check=True,
-                env={**os.environ, "GH_TOKEN": self.token},
+            result = _get_http_client().post(
+                GRAPHQL_URL,
+                content=orjson.dumps({"query": query, "variables": variables or {}}),
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Content-Type": "application/json",
+                },
             )
-            response = json.loads(result.stdout)
+            result.raise_for_status()
+            # Parse the raw bytes directly, skipping a separate text decode
+            response = orjson.loads(result.content)
 
             if "errors" in response:
                 error_msg = "; ".join([e.get("message", str(e)) for e in response["errors"]])
@@ -498,17 +658,22 @@ class GitHubAPIClient:
 
             return response.get("data", {})
 
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Failed to execute GraphQL query: {e.stderr}") from e
-        except json.JSONDecodeError as e:
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Failed to execute GraphQL query: {e.response.text}") from e
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to execute GraphQL query: {e}") from e
+        except orjson.JSONDecodeError as e:
             raise Exception(f"Failed to parse GraphQL response: {e}") from e
 
-    def _graphql_mutation(self, mutation: str) -> dict[str, Any]:
+    def _graphql_mutation(
+        self, mutation: str, variables: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """
-        Execute a GraphQL mutation using gh CLI
+        Execute a GraphQL mutation over the shared HTTP/2 client
 
         Args:
             mutation: GraphQL mutation string
+            variables: Values for the mutation's $variables
 
         Returns:
             Mutation response data
@@ -517,13 +682,69 @@ class GitHubAPIClient:
             Exception: If GraphQL mutation fails
         """
         # Mutations use the same API as queries
-        return self._graphql_query(mutation)
+        return self._graphql_query(mutation, variables)
+
 
+# Shared PyGithub clients per token (one connection pool across all repos)
+_github_by_token: dict[str, Github] = {}
+
+# Shared HTTP/2 client for direct API calls (GraphQL), created lazily; the
+# lock stops concurrent to_thread workers from each creating one
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
 
 # Cache of client instances per repository (singleton per repo)
 _clients: dict[str, GitHubAPIClient] = {}
 
 
+def _get_http_client() -> httpx.Client:
+    """
+    Get or create the shared HTTP client for direct GitHub API calls
+
+    HTTP/2 lets concurrent requests to api.github.com multiplex over a
+    single connection instead of opening one TLS connection each.
+
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _http_client
+
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE
+                    ),
+                    timeout=30.0,
+                )
+    return _http_client
+
+
+def _get_shared_github(token: str) -> Github:
+    """
+    Get or create the PyGithub client for a token
+
+    All GitHubAPIClient instances using the same token share one Github
+    object, so its HTTP connection pool is reused across repositories.
+
+    Args:
+        token: GitHub personal access token
+
+    Returns:
+        Shared Github instance
+    """
+    if token not in _github_by_token:
+        _github_by_token[token] = Github(
+            auth=Auth.Token(token),
+            per_page=PAGE_SIZE,
+            pool_size=POOL_SIZE,
+            retry=GithubRetry(total=3, backoff_factor=0.5),
+        )
+    return _github_by_token[token]
+
+
 def get_github_client(
     token: str | None = None, repo: str | None = None
 ) -> GitHubAPIClient:
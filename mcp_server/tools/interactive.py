@@ -4,12 +4,188 @@ Interactive workflow tools for MCP server
 These tools provide structured data for Claude to present to users,
 enabling interactive decision-making on uncertain PR comments.
 """
-import json
+import asyncio
+import functools
+import os
+import re
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable
+from contextlib import aclosing
+from dataclasses import dataclass
 from typing import Any
 
-from .analysis import analyze_comment_validity
+import orjson
+
+from .analysis import analyze_comment_validity, analyze_comments_validity_batch
 from .code_ops import create_comment_reply, resolve_thread
-from .comments import fetch_pr_comments, get_comment_context
+from .comments import (
+    fetch_all_comment_contexts,
+    fetch_pr_comments,
+    get_comment_context,
+)
+
+# Maximum number of comments analyzed concurrently
+_ANALYSIS_CONCURRENCY = 16
+
+
+def _concurrency_from_env(name: str, default: int) -> int:
+    """Read a concurrency limit of at least 1 from the environment, else default"""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+# Maximum number of comments bulk-closed concurrently
+_BULK_CONCURRENCY = _concurrency_from_env("MCP_BULK_CONCURRENCY", 10)
+
+# Fast-mode keyword classifier for lowercased bodies (checked in _FAST_PRIORITY order)
+_FAST_RE = re.compile(
+    r"(?P<sec>security|vulnerability|injection)"
+    r"|(?P<dup>duplicate|redundant)"
+    r"|(?P<imp>import|top of the file|module level)"
+)
+_FAST_PRIORITY = ("imp", "dup", "sec")
+# (status, confidence, reasoning) per keyword group
+_FAST_VALIDITY = {
+    "imp": ("uncertain", 0.5, "Import placement comment (fast mode)"),
+    "dup": ("needs_fix", 0.6, "Possible duplicate code (fast mode)"),
+    "sec": ("needs_fix", 0.8, "Security issue (fast mode)"),
+}
+_FAST_DEFAULT = ("uncertain", 0.3, "Needs review (fast mode)")
+
+# Stand-in for get_comment_context when context isn't requested
+_NO_CONTEXT = {"code_snippet": "(context omitted)"}
+
+# Comment fields used by fast mode
+_FAST_FIELDS = ["id", "body", "author", "status", "file_path", "line_number", "comment_type"]
+
+# Actions accepted by execute_comment_decision, and default replies for those that post one
+_ACTIONS = frozenset({"fix", "dismiss", "skip"})
+_DEFAULT_MESSAGES = {
+    "fix": "✅ Acknowledged - this will be addressed in the next update.",
+    "dismiss": "✅ Reviewed and confirmed - this is not an issue or has been addressed.",
+}
+
+# execute_comment_decision error payload, before comment_id and message are filled in
+_ERROR_BASE = {
+    "action_taken": "error",
+    "comment_id": "",
+    "reply_posted": False,
+    "reply_id": None,
+    "thread_resolved": False,
+    "message": "",
+}
+
+# Initial bulk_close_comments result entry, before comment_id is filled in
+_RESULT_TEMPLATE = {
+    "comment_id": "",
+    "success": False,
+    "reply_posted": False,
+    "thread_resolved": False,
+    "error": None,
+}
+
+# Suggested questions per analysis status (shared, never mutated)
+_Q_NEEDS_FIX = (
+    {
+        "label": "Fix this issue",
+        "description": "Keep thread open and acknowledge it will be fixed",
+        "action": "fix",
+    },
+    {
+        "label": "False positive",
+        "description": "Resolve thread - this is not actually an issue",
+        "action": "dismiss",
+    },
+    {
+        "label": "Skip for now",
+        "description": "Don't take any action on this comment",
+        "action": "skip",
+    },
+)
+_Q_ALREADY_FIXED = (
+    {
+        "label": "Confirmed fixed",
+        "description": "Resolve thread - issue has been addressed",
+        "action": "dismiss",
+    },
+    {
+        "label": "Not actually fixed",
+        "description": "Keep thread open - still needs work",
+        "action": "fix",
+    },
+    {
+        "label": "Skip for now",
+        "description": "Don't take any action on this comment",
+        "action": "skip",
+    },
+)
+_Q_UNCERTAIN = (
+    {
+        "label": "Needs fixing",
+        "description": "Keep thread open and acknowledge",
+        "action": "fix",
+    },
+    {
+        "label": "Not an issue",
+        "description": "Resolve thread and dismiss",
+        "action": "dismiss",
+    },
+    {
+        "label": "Skip for now",
+        "description": "Don't take any action",
+        "action": "skip",
+    },
+)
+_Q_ERROR = (
+    {
+        "label": "Skip this comment",
+        "description": "Could not analyze - skip for now",
+        "action": "skip",
+    },
+)
+_QS = {
+    "needs_fix": _Q_NEEDS_FIX,
+    "already_fixed": _Q_ALREADY_FIXED,
+    "uncertain": _Q_UNCERTAIN,
+}
+
+
+@dataclass(slots=True)
+class Decision:
+    """A comment needing a user decision, as listed in decisions_needed"""
+
+    comment_id: str
+    file_path: str
+    line_number: int
+    author: str
+    body: str
+    status: str
+    code_context: str
+    ai_analysis: dict[str, Any]
+    suggested_questions: tuple[dict[str, str], ...]
+
+    @classmethod
+    def for_comment(
+        cls,
+        comment: dict[str, Any],
+        code_context: str,
+        ai_analysis: dict[str, Any],
+        suggested_questions: tuple[dict[str, str], ...],
+    ) -> "Decision":
+        """Build a decision, reading each comment field exactly once"""
+        get = comment.get
+        return cls(
+            comment["id"],
+            get("file_path", "N/A"),
+            get("line_number", 0),
+            get("author", "unknown"),
+            get("body", ""),
+            get("status", "unknown"),
+            code_context,
+            ai_analysis,
+            suggested_questions,
+        )
 
 
 async def prepare_comment_decisions(
@@ -17,6 +193,7 @@ async def prepare_comment_decisions(
     repo: str | None = None,
     filters: dict[str, Any] | None = None,
     fast_mode: bool = False,
+    include_context: bool | None = None,
 ) -> str:
     """
     Prepare structured data for uncertain comments that need user decisions.
@@ -31,6 +208,9 @@ async def prepare_comment_decisions(
         pr_number: PR number to analyze
         repo: Repository in 'owner/name' format (optional)
         filters: Optional filters like {'status': 'open', 'author': 'Copilot'}
+        fast_mode: Classify by keyword instead of full analysis
+        include_context: Fetch the code around each comment for display
+            (default: True, or False in fast mode)
 
     Returns:
         JSON string with structure:
@@ -70,195 +250,256 @@ async def prepare_comment_decisions(
         >>>     # Claude presents this to user via AskUserQuestion
         >>>     print(comment['body'], comment['code_context'])
     """
-    # Fetch all comments
-    comments_raw = await fetch_pr_comments(pr_number=pr_number, repo=repo)
+    # Fetch all comments (fast mode only keeps the fields it classifies and reports)
+    comments = await fetch_pr_comments(
+        pr_number=pr_number, repo=repo, fields=_FAST_FIELDS if fast_mode else None
+    )
 
-    if isinstance(comments_raw, str):
-        comments = json.loads(comments_raw)
-    else:
-        comments = comments_raw
+    # Filter to review comments matching any additional filters
+    review_comments = _select_review_comments(comments, filters)
 
-    # Filter to review comments
-    review_comments = [c for c in comments if c.get("comment_type") == "review_comment"]
+    # Slow mode: analyze every comment in one batch, keyed by comment ID
+    validities: dict[str, dict[str, Any]] = {}
+    if not fast_mode and review_comments:
+        try:
+            batch = await analyze_comments_validity_batch(review_comments, pr_number, repo)
+            validities = {v["comment_id"]: v for v in batch}
+        except Exception:
+            # Fall back to per-comment analysis in _analyze_one
+            validities = {}
+
+    # Work concurrently, bounded to avoid secondary rate limits
+    sem = asyncio.Semaphore(_ANALYSIS_CONCURRENCY)
+
+    # Phase 1: classify every comment, keeping failures and those needing a decision
+    results = await asyncio.gather(
+        *[
+            _bounded(
+                sem,
+                _get_validity(
+                    comment, pr_number, repo, fast_mode, validities.get(comment["id"])
+                ),
+            )
+            for comment in review_comments
+        ],
+        return_exceptions=True,
+    )
+    kept: list[tuple[dict[str, Any], dict[str, Any] | BaseException]] = [
+        (comment, validity)
+        for comment, validity in zip(review_comments, results, strict=True)
+        if isinstance(validity, BaseException) or _needs_decision(validity)
+    ]
+
+    # Phase 2: fetch code context for all kept comments in one batch, keyed by
+    # comment ID. Context is only shown to the user, so fast-mode triage skips
+    # it unless asked.
+    if include_context is None:
+        include_context = not fast_mode
+
+    contexts: dict[str, dict[str, Any] | BaseException] = {}
+    context_ids = [
+        comment["id"]
+        for comment, validity in kept
+        if not isinstance(validity, BaseException)
+    ]
+    if include_context and context_ids:
+        try:
+            prefetched = await fetch_all_comment_contexts(
+                pr_number, repo, lines_before=5, lines_after=5
+            )
+            contexts.update(
+                (cid, prefetched[cid]) for cid in context_ids if cid in prefetched
+            )
+        except Exception:
+            # Fall back to fetching each comment's context on its own
+            pass
+
+        missing = [cid for cid in context_ids if cid not in contexts]
+        fetched = await asyncio.gather(
+            *[
+                _bounded(
+                    sem,
+                    get_comment_context(
+                        comment_id=comment_id,
+                        pr_number=pr_number,
+                        repo=repo,
+                        lines_before=5,
+                        lines_after=5,
+                    ),
+                )
+                for comment_id in missing
+            ],
+            return_exceptions=True,
+        )
+        contexts.update(zip(missing, fetched, strict=True))
+
+    # Phase 3: assemble decisions in comment order
+    decisions_needed = [
+        _error_decision(comment, validity)
+        if isinstance(validity, BaseException)
+        else _build_decision(comment, validity, contexts.get(comment["id"], _NO_CONTEXT))
+        for comment, validity in kept
+    ]
+
+    # orjson serializes the Decision dataclasses directly
+    return orjson.dumps(
+        {
+            "total_comments": len(comments),
+            "review_comments": len(review_comments),
+            "actionable_comments": len(decisions_needed),
+            "decisions_needed": decisions_needed,
+        },
+        option=orjson.OPT_INDENT_2,
+    ).decode()
 
-    # Apply any additional filters
-    if filters:
-        if "status" in filters:
-            review_comments = [c for c in review_comments if c.get("status") == filters["status"]]
-        if "author" in filters:
-            review_comments = [c for c in review_comments if c.get("author") == filters["author"]]
 
-    # Analyze each comment and gather context
-    decisions_needed = []
+def _select_review_comments(
+    comments: list[dict[str, Any]], filters: dict[str, Any] | None
+) -> list[dict[str, Any]]:
+    """
+    Select review comments matching optional status/author filters in one pass.
 
-    for comment in review_comments:
-        comment_id = comment["id"]
+    Args:
+        comments: Comment dicts from fetch_pr_comments
+        filters: Optional filters like {'status': 'open', 'author': 'Copilot'}
 
-        try:
-            # Fast mode: Use simple pattern matching instead of LLM analysis
-            if fast_mode:
-                body_lower = comment.get("body", "").lower()
-
-                # Simple heuristic classification
-                if any(word in body_lower for word in ["import", "top of the file", "module level"]):
-                    validity = {"status": "uncertain", "confidence": 0.5, "reasoning": "Import placement comment (fast mode)"}
-                elif any(word in body_lower for word in ["duplicate", "redundant"]):
-                    validity = {"status": "needs_fix", "confidence": 0.6, "reasoning": "Possible duplicate code (fast mode)"}
-                elif any(word in body_lower for word in ["security", "vulnerability", "injection"]):
-                    validity = {"status": "needs_fix", "confidence": 0.8, "reasoning": "Security issue (fast mode)"}
-                else:
-                    validity = {"status": "uncertain", "confidence": 0.3, "reasoning": "Needs review (fast mode)"}
-            else:
-                # Slow mode: Full LLM analysis
-                validity_raw = await analyze_comment_validity(
-                    comment_id=comment_id, pr_number=pr_number, repo=repo
-                )
+    Returns:
+        Matching review comments, in original order
+    """
+    status_f = filters.get("status") if filters else None
+    author_f = filters.get("author") if filters else None
 
-                if isinstance(validity_raw, str):
-                    validity = json.loads(validity_raw)
-                else:
-                    validity = validity_raw
-
-            # Only include comments that need user decision
-            status = validity.get("status", "unknown")
-            confidence = validity.get("confidence", 0)
-
-            # Include if:
-            # - Status is uncertain
-            # - Status is needs_fix but confidence < 70%
-            # - Status is already_fixed but confidence < 60%
-            needs_decision = (
-                status == "uncertain"
-                or (status == "needs_fix" and confidence < 0.7)
-                or (status == "already_fixed" and confidence < 0.6)
-            )
+    return [
+        c
+        for c in comments
+        if c.get("comment_type") == "review_comment"
+        and (status_f is None or c.get("status") == status_f)
+        and (author_f is None or c.get("author") == author_f)
+    ]
 
-            if not needs_decision:
-                continue
 
-            # Get code context
-            context_raw = await get_comment_context(
-                comment_id=comment_id, pr_number=pr_number, repo=repo, lines_before=5, lines_after=5
-            )
+async def _bounded(sem: asyncio.Semaphore, aw: Awaitable[Any]) -> Any:
+    """Await aw while holding sem"""
+    async with sem:
+        return await aw
 
-            if isinstance(context_raw, str):
-                context = json.loads(context_raw)
-            else:
-                context = context_raw
 
-            # Determine suggested actions based on analysis
-            suggested_questions = []
+async def _get_validity(
+    comment: dict[str, Any],
+    pr_number: int,
+    repo: str | None,
+    fast_mode: bool,
+    validity: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """
+    Classify one review comment for prepare_comment_decisions.
 
-            if status == "needs_fix":
-                suggested_questions = [
-                    {
-                        "label": "Fix this issue",
-                        "description": "Keep thread open and acknowledge it will be fixed",
-                        "action": "fix",
-                    },
-                    {
-                        "label": "False positive",
-                        "description": "Resolve thread - this is not actually an issue",
-                        "action": "dismiss",
-                    },
-                    {
-                        "label": "Skip for now",
-                        "description": "Don't take any action on this comment",
-                        "action": "skip",
-                    },
-                ]
-            elif status == "already_fixed":
-                suggested_questions = [
-                    {
-                        "label": "Confirmed fixed",
-                        "description": "Resolve thread - issue has been addressed",
-                        "action": "dismiss",
-                    },
-                    {
-                        "label": "Not actually fixed",
-                        "description": "Keep thread open - still needs work",
-                        "action": "fix",
-                    },
-                    {
-                        "label": "Skip for now",
-                        "description": "Don't take any action on this comment",
-                        "action": "skip",
-                    },
-                ]
-            else:  # uncertain
-                suggested_questions = [
-                    {
-                        "label": "Needs fixing",
-                        "description": "Keep thread open and acknowledge",
-                        "action": "fix",
-                    },
-                    {
-                        "label": "Not an issue",
-                        "description": "Resolve thread and dismiss",
-                        "action": "dismiss",
-                    },
-                    {
-                        "label": "Skip for now",
-                        "description": "Don't take any action",
-                        "action": "skip",
-                    },
-                ]
+    Args:
+        validity: Precomputed batch analysis, or None to analyze this comment alone
 
-            # Build decision object
-            decisions_needed.append(
-                {
-                    "comment_id": str(comment_id),
-                    "file_path": comment.get("file_path", "N/A"),
-                    "line_number": comment.get("line_number", 0),
-                    "author": comment.get("author", "unknown"),
-                    "body": comment.get("body", ""),
-                    "status": comment.get("status", "unknown"),
-                    "code_context": context.get("code_context", "No context available"),
-                    "ai_analysis": {
-                        "status": status,
-                        "confidence": confidence,
-                        "reasoning": validity.get("reasoning", ""),
-                        "suggested_action": validity.get("suggested_action", ""),
-                    },
-                    "suggested_questions": suggested_questions,
-                }
-            )
+    Returns:
+        Validity dict with at least status and confidence
+    """
+    # Fast mode: Use simple pattern matching instead of LLM analysis
+    if fast_mode:
+        status, confidence, reasoning = _fast_classify(comment.get("body", "").lower())
+        return {"status": status, "confidence": confidence, "reasoning": reasoning}
+
+    if validity is None:
+        # Slow mode without a batch result: analyze this comment alone
+        validity = await analyze_comment_validity(
+            comment_id=comment["id"], pr_number=pr_number, repo=repo
+        )
 
-        except Exception as e:
-            # If we can't analyze a comment, include it as uncertain
-            decisions_needed.append(
-                {
-                    "comment_id": str(comment_id),
-                    "file_path": comment.get("file_path", "N/A"),
-                    "line_number": comment.get("line_number", 0),
-                    "author": comment.get("author", "unknown"),
-                    "body": comment.get("body", ""),
-                    "status": comment.get("status", "unknown"),
-                    "code_context": "Error retrieving context",
-                    "ai_analysis": {
-                        "status": "error",
-                        "confidence": 0,
-                        "reasoning": f"Error analyzing comment: {str(e)}",
-                        "suggested_action": "",
-                    },
-                    "suggested_questions": [
-                        {
-                            "label": "Skip this comment",
-                            "description": "Could not analyze - skip for now",
-                            "action": "skip",
-                        }
-                    ],
-                }
-            )
+    return validity
 
-    return json.dumps(
-        {
-            "total_comments": len(comments),
-            "review_comments": len(review_comments),
-            "actionable_comments": len(decisions_needed),
-            "decisions_needed": decisions_needed,
+
+@functools.lru_cache(maxsize=4096)
+def _fast_classify(body_lower: str) -> tuple[str, float, str]:
+    """
+    Classify a lowercased comment body by keyword for fast mode.
+
+    One regex scan finds every keyword group, then the highest-priority
+    group wins. Memoized because bot reviewers repeat the same boilerplate
+    across a PR.
+
+    Returns:
+        (status, confidence, reasoning)
+    """
+    found = {m.lastgroup for m in _FAST_RE.finditer(body_lower)}
+    return next(
+        (_FAST_VALIDITY[group] for group in _FAST_PRIORITY if group in found),
+        _FAST_DEFAULT,
+    )
+
+
+def _needs_decision(validity: dict[str, Any]) -> bool:
+    """
+    Check whether a classified comment needs user input.
+
+    Include if:
+    - Status is uncertain
+    - Status is needs_fix but confidence < 70%
+    - Status is already_fixed but confidence < 60%
+    """
+    status: str = validity.get("status", "unknown")
+    confidence: float = validity.get("confidence", 0)
+
+    return (
+        status == "uncertain"
+        or (status == "needs_fix" and confidence < 0.7)
+        or (status == "already_fixed" and confidence < 0.6)
+    )
+
+
+def _build_decision(
+    comment: dict[str, Any],
+    validity: dict[str, Any],
+    context: dict[str, Any] | BaseException,
+) -> Decision:
+    """
+    Build the decision entry for one kept comment.
+
+    Args:
+        comment: Review comment dict
+        validity: Validity dict from _get_validity
+        context: Result of get_comment_context, or the exception it raised
+
+    Returns:
+        Decision, or the error entry if context retrieval failed
+    """
+    if isinstance(context, BaseException):
+        return _error_decision(comment, context)
+
+    get = validity.get
+    status = get("status", "unknown")
+
+    # Build decision object
+    return Decision.for_comment(
+        comment,
+        code_context=context.get("code_snippet") or "No context available",
+        ai_analysis={
+            "status": status,
+            "confidence": get("confidence", 0),
+            "reasoning": get("reasoning", ""),
+            "suggested_action": get("suggested_action", ""),
+        },
+        suggested_questions=_QS.get(status, _Q_UNCERTAIN),
+    )
+
+
+def _error_decision(comment: dict[str, Any], error: BaseException) -> Decision:
+    """Build the skip-only entry for a comment that couldn't be analyzed"""
+    return Decision.for_comment(
+        comment,
+        code_context="Error retrieving context",
+        ai_analysis={
+            "status": "error",
+            "confidence": 0,
+            "reasoning": f"Error analyzing comment: {str(error)}",
+            "suggested_action": "",
         },
-        indent=2,
+        suggested_questions=_Q_ERROR,
     )
 
 
@@ -305,8 +546,18 @@ async def execute_comment_decision(
         ...     message="Not an issue - this is intentional for Docker compatibility"
         ... )
     """
+    # Validate input before touching the network
+    if action not in _ACTIONS:
+        return orjson.dumps(
+            {
+                **_ERROR_BASE,
+                "comment_id": comment_id,
+                "message": f"Invalid action: {action}. Must be 'fix', 'dismiss', or 'skip'.",
+            }
+        ).decode()
+
     if action == "skip":
-        return json.dumps(
+        return orjson.dumps(
             {
                 "action_taken": "skip",
                 "comment_id": comment_id,
@@ -315,70 +566,51 @@ async def execute_comment_decision(
                 "thread_resolved": False,
                 "message": "Skipped - no action taken",
             }
-        )
+        ).decode()
+
+    if not comment_id.isdigit():
+        return orjson.dumps(
+            {
+                **_ERROR_BASE,
+                "comment_id": comment_id,
+                "message": f"Invalid comment_id: {comment_id}. Must be a numeric comment ID.",
+            }
+        ).decode()
 
     # Determine message if not provided
-    if not message:
-        if action == "fix":
-            message = "✅ Acknowledged - this will be addressed in the next update."
-        elif action == "dismiss":
-            message = "✅ Reviewed and confirmed - this is not an issue or has been addressed."
-        else:
-            return json.dumps(
-                {
-                    "action_taken": "error",
-                    "comment_id": comment_id,
-                    "reply_posted": False,
-                    "reply_id": None,
-                    "thread_resolved": False,
-                    "message": f"Invalid action: {action}. Must be 'fix', 'dismiss', or 'skip'.",
-                }
-            )
+    message = message or _DEFAULT_MESSAGES[action]
 
     # Post reply
     try:
-        reply_raw = await create_comment_reply(
+        reply = await create_comment_reply(
             comment_id=comment_id, pr_number=pr_number, repo=repo, message=message
         )
 
-        if isinstance(reply_raw, str):
-            reply = json.loads(reply_raw)
-        else:
-            reply = reply_raw
-
         reply_id = reply.get("id")
         reply_posted = True
 
     except Exception as e:
-        return json.dumps(
+        return orjson.dumps(
             {
-                "action_taken": "error",
+                **_ERROR_BASE,
                 "comment_id": comment_id,
-                "reply_posted": False,
-                "reply_id": None,
-                "thread_resolved": False,
                 "message": f"Error posting reply: {str(e)}",
             }
-        )
+        ).decode()
 
     # Resolve thread if action is 'dismiss'
     thread_resolved = False
     if action == "dismiss":
         try:
-            resolution_raw = await resolve_thread(
+            resolution = await resolve_thread(
                 comment_id=comment_id, pr_number=pr_number, repo=repo
             )
 
-            if isinstance(resolution_raw, str):
-                resolution = json.loads(resolution_raw)
-            else:
-                resolution = resolution_raw
-
             thread_resolved = resolution.get("is_resolved", False)
 
         except Exception as e:
             # Reply was posted but resolution failed - still return success
-            return json.dumps(
+            return orjson.dumps(
                 {
                     "action_taken": action,
                     "comment_id": comment_id,
@@ -387,9 +619,9 @@ async def execute_comment_decision(
                     "thread_resolved": False,
                     "message": f"Reply posted but failed to resolve thread: {str(e)}",
                 }
-            )
+            ).decode()
 
-    return json.dumps(
+    return orjson.dumps(
         {
             "action_taken": action,
             "comment_id": comment_id,
@@ -398,7 +630,7 @@ async def execute_comment_decision(
             "thread_resolved": thread_resolved,
             "message": "Success",
         }
-    )
+    ).decode()
 
 
 async def bulk_close_comments(
@@ -407,6 +639,7 @@ async def bulk_close_comments(
     message: str = "✅ Acknowledged by MCP - thread closed",
     filters: dict[str, Any] | None = None,
     resolve_threads: bool = True,
+    max_failures: int | None = None,
 ) -> str:
     """
     Bulk close all comments with a generic message.
@@ -422,6 +655,9 @@ async def bulk_close_comments(
         message: Message to post to all comments (default: "✅ Acknowledged by MCP - thread closed")
         filters: Optional filters like {'status': 'open', 'author': 'Copilot'}
         resolve_threads: Whether to resolve threads after posting (default: True)
+        max_failures: Stop starting new comments after this many failures;
+            comments already in flight still finish and are reported
+            (default: process every comment)
 
     Returns:
         JSON string with results:
@@ -441,6 +677,9 @@ async def bulk_close_comments(
             ]
         }
 
+        Results are listed in the order comments finished processing.
+        If max_failures is reached, "processed" is less than "total_comments".
+
     Example:
         >>> result = await bulk_close_comments(
         ...     pr_number=77,
@@ -450,64 +689,150 @@ async def bulk_close_comments(
         ... )
     """
     # Fetch all comments
-    comments_raw = await fetch_pr_comments(pr_number=pr_number, repo=repo)
-
-    if isinstance(comments_raw, str):
-        comments = json.loads(comments_raw)
-    else:
-        comments = comments_raw
-
-    # Filter to review comments only
-    review_comments = [c for c in comments if c.get("comment_type") == "review_comment"]
+    comments = await fetch_pr_comments(pr_number=pr_number, repo=repo)
 
-    # Apply additional filters if provided
-    if filters:
-        if "status" in filters:
-            review_comments = [c for c in review_comments if c.get("status") == filters["status"]]
-        if "author" in filters:
-            review_comments = [c for c in review_comments if c.get("author") == filters["author"]]
+    # Filter to review comments matching any additional filters
+    review_comments = _select_review_comments(comments, filters)
 
     total_comments = len(review_comments)
+
     results = []
-    succeeded = 0
     failed = 0
+    stop = asyncio.Event()
+    async with aclosing(
+        _close_all(review_comments, pr_number, repo, message, resolve_threads, stop)
+    ) as closing:
+        async for result_entry in closing:
+            results.append(result_entry)
+
+            if not result_entry["success"]:
+                failed += 1
+                if max_failures is not None and failed >= max_failures:
+                    # Comments not yet started are skipped; in-flight ones
+                    # may already have posted, so let them finish and report
+                    stop.set()
+
+    succeeded = len(results) - failed
+
+    return orjson.dumps(
+        {
+            "total_comments": total_comments,
+            "processed": len(results),
+            "succeeded": succeeded,
+            "failed": failed,
+            "results": results,
+        },
+        option=orjson.OPT_INDENT_2,
+    ).decode()
 
-    # Process each comment
-    for comment in review_comments:
-        comment_id = str(comment["id"])
-        result_entry = {
-            "comment_id": comment_id,
-            "success": False,
-            "reply_posted": False,
-            "thread_resolved": False,
-            "error": None,
-        }
+
+async def bulk_close_comments_stream(
+    pr_number: int,
+    repo: str | None = None,
+    message: str = "✅ Acknowledged by MCP - thread closed",
+    filters: dict[str, Any] | None = None,
+    resolve_threads: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Bulk close comments, streaming one result per comment as it finishes.
+
+    Streaming variant of bulk_close_comments for callers that can consume
+    incremental output: nothing is accumulated, and progress is visible
+    before the whole PR has been processed.
+
+    Args:
+        Same as bulk_close_comments
+
+    Yields:
+        Newline-terminated JSON lines (ndjson), one per comment, in
+        completion order, each shaped like an entry of
+        bulk_close_comments' "results" list
+
+    Example:
+        >>> async for line in bulk_close_comments_stream(pr_number=77, repo="owner/repo"):
+        ...     print(json.loads(line)["comment_id"])
+    """
+    comments = await fetch_pr_comments(pr_number=pr_number, repo=repo)
+    review_comments = _select_review_comments(comments, filters)
+
+    async with aclosing(
+        _close_all(review_comments, pr_number, repo, message, resolve_threads)
+    ) as closing:
+        async for result_entry in closing:
+            yield orjson.dumps(result_entry).decode() + "\n"
+
+
+async def _close_all(
+    review_comments: list[dict[str, Any]],
+    pr_number: int,
+    repo: str | None,
+    message: str,
+    resolve_threads: bool,
+    stop: asyncio.Event | None = None,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """
+    Close review comments concurrently, yielding result entries as they finish.
+
+    At most MCP_BULK_CONCURRENCY (default 10, minimum 1) comments are processed at a
+    time. Once stop is set, comments that haven't started are skipped (and not
+    yielded) while in-flight ones finish. Tasks still pending when the consumer
+    stops iterating are cancelled.
+    """
+    sem = asyncio.Semaphore(_BULK_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(
+            _close_one(comment, pr_number, repo, message, resolve_threads, sem, stop)
+        )
+        for comment in review_comments
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result_entry = await next_done
+            if result_entry is not None:
+                yield result_entry
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _close_one(
+    comment: dict[str, Any],
+    pr_number: int,
+    repo: str | None,
+    message: str,
+    resolve_threads: bool,
+    sem: asyncio.Semaphore,
+    stop: asyncio.Event | None = None,
+) -> dict[str, Any] | None:
+    """
+    Reply to (and optionally resolve) one comment for bulk_close_comments.
+
+    Returns:
+        Result entry for the comment (errors are recorded, never raised), or
+        None if stop was set before the comment started
+    """
+    comment_id = comment["id"]  # PRComment.id is already a string
+    result_entry = {**_RESULT_TEMPLATE, "comment_id": comment_id}
+
+    async with sem:
+        if stop is not None and stop.is_set():
+            return None
 
         try:
             # Post reply
-            reply_raw = await create_comment_reply(
+            await create_comment_reply(
                 comment_id=comment_id, pr_number=pr_number, repo=repo, message=message
             )
-
-            if isinstance(reply_raw, str):
-                reply = json.loads(reply_raw)
-            else:
-                reply = reply_raw
-
             result_entry["reply_posted"] = True
 
             # Resolve thread if requested
             if resolve_threads:
                 try:
-                    resolution_raw = await resolve_thread(
+                    resolution = await resolve_thread(
                         comment_id=comment_id, pr_number=pr_number, repo=repo
                     )
 
-                    if isinstance(resolution_raw, str):
-                        resolution = json.loads(resolution_raw)
-                    else:
-                        resolution = resolution_raw
-
                     result_entry["thread_resolved"] = resolution.get("is_resolved", False)
 
                 except Exception as e:
@@ -515,21 +840,8 @@ async def bulk_close_comments(
                     result_entry["error"] = f"Reply posted but resolution failed: {str(e)}"
 
             result_entry["success"] = True
-            succeeded += 1
 
         except Exception as e:
             result_entry["error"] = str(e)
-            failed += 1
-
-        results.append(result_entry)
 
-    return json.dumps(
-        {
-            "total_comments": total_comments,
-            "processed": len(results),
-            "succeeded": succeeded,
-            "failed": failed,
-            "results": results,
-        },
-        indent=2,
-    )
+    return result_entry
@@ -5,6 +5,7 @@ Enhanced version of analysis tools that use pattern matching
 for higher accuracy without requiring LLM API calls.
 """
 
+import asyncio
 from typing import Any
 
 from ..models import ValidityAnalysis, ValidityStatus
@@ -12,11 +13,16 @@ from ..patterns import COMMON_BOT_AUTHORS, SmartAnalyzer
 from .comments import get_comment_context
 from .github_api import get_github_client
 
+# Known bot authors, as a set for constant-time membership checks
+_BOT_AUTHORS = frozenset(COMMON_BOT_AUTHORS)
+
 
 async def analyze_comment_smart(
     comment_id: str,
     pr_number: int,
     repo: str,
+    comment_body: str | None = None,
+    context: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
     Smart analysis using pattern recognition (Phase 1.5)
@@ -28,6 +34,9 @@ async def analyze_comment_smart(
         comment_id: Comment ID to analyze
         pr_number: PR number
         repo: Repository in format "owner/repo"
+        comment_body: Comment text, if already fetched
+        context: Code context from get_comment_context or
+            fetch_all_comment_contexts, if already fetched
 
     Returns:
         Enhanced analysis with:
@@ -47,23 +56,27 @@ async def analyze_comment_smart(
         >>> print(analysis['confidence'])  # 0.85
         >>> print(analysis['can_auto_fix'])  # True
     """
-    # Get GitHub client
-    client = get_github_client(repo=repo)
+    if comment_body is None:
+        # Get GitHub client
+        client = get_github_client(repo=repo)
+
+        # Find the comment (in a worker thread so concurrent analyses overlap)
+        comments = await asyncio.to_thread(client.get_all_pr_comments, pr_number)
+        comment = next((c for c in comments if c.id == comment_id), None)
 
-    # Find the comment
-    comments = client.get_all_pr_comments(pr_number)
-    comment = next((c for c in comments if c.id == comment_id), None)
+        if not comment:
+            raise ValueError(f"Comment {comment_id} not found in PR {pr_number}")
 
-    if not comment:
-        raise ValueError(f"Comment {comment_id} not found in PR {pr_number}")
+        comment_body = comment.body
 
     # Get code context
-    context = await get_comment_context(comment_id, pr_number, repo)
+    if context is None:
+        context = await get_comment_context(comment_id, pr_number, repo)
 
     # Use smart analyzer
     analyzer = SmartAnalyzer()
     smart_result = analyzer.analyze_with_patterns(
-        comment_body=comment.body,
+        comment_body=comment_body,
         code_snippet=context.get("code_snippet", ""),
         file_path=context.get("file_path", ""),
         line_number=context.get("line_number", 0),
@@ -101,7 +114,7 @@ def is_bot_comment(author: str) -> bool:
     Returns:
         True if author is a known bot
     """
-    return author in COMMON_BOT_AUTHORS
+    return author in _BOT_AUTHORS
 
 
 def get_bot_comment_filters() -> dict[str, Any]:
@@ -1,5 +1,6 @@
 """Utility modules for the MCP server."""
 
+from .event_loop import run_async
 from .git_detector import detect_github_repo, parse_github_url, prompt_for_repo
 
-__all__ = ["detect_github_repo", "parse_github_url", "prompt_for_repo"]
+__all__ = ["detect_github_repo", "parse_github_url", "prompt_for_repo", "run_async"]
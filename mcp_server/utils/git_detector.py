@@ -1,15 +1,32 @@
 """Git repository detection utilities for auto-detecting GitHub repos."""
 
+import configparser
+import os
 import re
 import subprocess
 from pathlib import Path
 from typing import Optional
 
+# GitHub remote URL formats in one pattern: https://github.com/owner/repo,
+# git@github.com:owner/repo and github.com:owner/repo, each with an optional
+# ".git" suffix and trailing slash or path
+_GITHUB_URL_RE = re.compile(
+    r"(?:https?://github\.com/|(?:git@)?github\.com:)"
+    r"([^/]+)/([^/]+?)(?:\.git)?(?:/.*)?$"
+)
+
+# Successfully detected repositories per working directory
+_repo_by_cwd: dict[str, str] = {}
+
 
 def detect_github_repo() -> Optional[str]:
     """
     Auto-detect the GitHub repository from the current git directory.
 
+    Successful results are cached per working directory, since the git
+    remote rarely changes during the lifetime of the process. Failures
+    are not cached, so a remote configured later is still picked up.
+
     Returns:
         Optional[str]: Repository in "owner/repo" format, or None if not detected
 
@@ -17,6 +34,58 @@ def detect_github_repo() -> Optional[str]:
         >>> detect_github_repo()
         'mark.johnson/claude_mcp_agent_github_comments'
     """
+    cwd = os.getcwd()
+    repo = _repo_by_cwd.get(cwd)
+    if repo is None:
+        repo = _detect_github_repo_in(cwd)
+        if repo is not None:
+            _repo_by_cwd[cwd] = repo
+    return repo
+
+
+def _detect_github_repo_in(cwd: str) -> Optional[str]:
+    """
+    Detect the GitHub repository for a working directory.
+
+    Reads the origin URL straight from .git/config, falling back to
+    running git (e.g. for worktrees or URL rewrites) if that fails.
+    """
+    try:
+        git_dir = _find_git_dir(Path(cwd))
+        if git_dir is not None:
+            config = configparser.ConfigParser(strict=False, interpolation=None)
+            config.read(git_dir / "config")
+            repo = parse_github_url(config.get('remote "origin"', "url", fallback=""))
+            if repo:
+                return repo
+    except Exception:
+        pass  # Fall back to asking git
+
+    return _detect_github_repo_with_git(cwd)
+
+
+def _find_git_dir(start: Path) -> Optional[Path]:
+    """
+    Find the .git directory for start or its nearest parent.
+
+    Args:
+        start: Directory to start searching from
+
+    Returns:
+        Optional[Path]: Path to the .git directory, or None if not found
+    """
+    for path in (start, *start.parents):
+        git_path = path / ".git"
+        if git_path.is_dir():
+            return git_path
+        if git_path.exists():
+            # .git file (worktree/submodule) - let git resolve it
+            return None
+    return None
+
+
+def _detect_github_repo_with_git(cwd: str) -> Optional[str]:
+    """Detect the GitHub repository by running 'git remote get-url origin'."""
     try:
         # Try to get the remote URL from git
         result = subprocess.run(
@@ -24,7 +93,8 @@ def detect_github_repo() -> Optional[str]:
             capture_output=True,
             text=True,
             check=True,
-            timeout=5
+            timeout=5,
+            cwd=cwd,
         )
 
         remote_url = result.stdout.strip()
@@ -63,37 +133,13 @@ def parse_github_url(url: str) -> Optional[str]:
         >>> parse_github_url("https://github.com/owner/repo")
         'owner/repo'
     """
-    if not url:
+    match = _GITHUB_URL_RE.match(url) if url else None
+    if not match:
+        # Not a recognized GitHub URL
         return None
 
-    # Remove .git suffix if present
-    url = url.rstrip("/")
-    if url.endswith(".git"):
-        url = url[:-4]
-
-    # Pattern 1: HTTPS format - https://github.com/owner/repo
-    https_pattern = r"https?://github\.com/([^/]+)/([^/]+)"
-    match = re.match(https_pattern, url)
-    if match:
-        owner, repo = match.groups()
-        return f"{owner}/{repo}"
-
-    # Pattern 2: SSH format - git@github.com:owner/repo
-    ssh_pattern = r"git@github\.com:([^/]+)/(.+)"
-    match = re.match(ssh_pattern, url)
-    if match:
-        owner, repo = match.groups()
-        return f"{owner}/{repo}"
-
-    # Pattern 3: Short SSH format - github.com:owner/repo
-    short_ssh_pattern = r"github\.com:([^/]+)/(.+)"
-    match = re.match(short_ssh_pattern, url)
-    if match:
-        owner, repo = match.groups()
-        return f"{owner}/{repo}"
-
-    # Not a recognized GitHub URL
-    return None
+    owner, repo = match.groups()
+    return f"{owner}/{repo}"
 
 
 def prompt_for_repo() -> Optional[str]:
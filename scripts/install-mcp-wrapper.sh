@@ -49,8 +49,9 @@ SETUP INSTRUCTIONS:
 4. Restart Claude Code CLI
 """
 import os
+import site
+import subprocess
 import sys
-import asyncio
 from pathlib import Path
 
 # ==================== CONFIGURATION ====================
@@ -60,6 +61,13 @@ from pathlib import Path
 VENV_PATH = Path.home() / ".venvs" / "github-pr-mcp"
 PYTHON_PATH = VENV_PATH / "bin" / "python"
 
+# Normalized once so startup checks are plain string compares and single stats
+VENV_PATH_STR = os.path.normpath(str(VENV_PATH))
+PYTHON_PATH_STR = os.path.normpath(str(PYTHON_PATH))
+SITE_PACKAGES_STR = os.path.join(
+    VENV_PATH_STR, "lib", f"python{sys.version_info.major}.{sys.version_info.minor}", "site-packages"
+)
+
 # TODO: Add your GitHub token and repo
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "your-token-here")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "owner/repo")
@@ -78,23 +86,44 @@ def main():
         print(f"   Edit: {__file__}")
         sys.exit(1)
 
-    # Set environment variables
-    os.environ["GITHUB_TOKEN"] = GITHUB_TOKEN
-    os.environ["GITHUB_REPO"] = GITHUB_REPO
-    os.environ["LOG_LEVEL"] = LOG_LEVEL
-    os.environ["MCP_LOG_FILE"] = LOG_FILE
-
-    # If not using the correct Python, exec with it
-    if PYTHON_PATH.exists() and Path(sys.executable).resolve() != PYTHON_PATH.resolve():
-        os.execv(str(PYTHON_PATH), [str(PYTHON_PATH)] + sys.argv)
+    # Resolve the venv before touching the environment or importing the server
+    in_venv = sys.prefix == VENV_PATH_STR
+    has_site_packages = not in_venv and os.path.isdir(SITE_PACKAGES_STR)
+    has_venv_python = not (in_venv or has_site_packages) and os.path.exists(PYTHON_PATH_STR)
+
+    # Set environment variables, skipping any that already hold the same value
+    env = {
+        "GITHUB_TOKEN": GITHUB_TOKEN,
+        "GITHUB_REPO": GITHUB_REPO,
+        "LOG_LEVEL": LOG_LEVEL,
+        "MCP_LOG_FILE": LOG_FILE,
+    }
+    os.environ.update({k: v for k, v in env.items() if os.environ.get(k) != v})
+
+    # If not running in the venv, load its packages into this process
+    if has_site_packages:
+        # addsitedir appends; move the venv entries (incl. .pth paths) to the front
+        n = len(sys.path)
+        site.addsitedir(SITE_PACKAGES_STR)
+        venv_paths = sys.path[n:]
+        del sys.path[n:]
+        sys.path[:0] = venv_paths
+    elif has_venv_python:
+        # Venv was built for another Python version - run it as a child process
+        sys.exit(subprocess.run([PYTHON_PATH_STR] + sys.argv).returncode)
 
     # Import and run the server
     try:
         from mcp_server.server import main as server_main
-        asyncio.run(server_main())
+        from mcp_server.utils import run_async
+        run_async(server_main())
     except ImportError as e:
         print(f"❌ Package not found: {e}")
-        print(f"   Expected location: {VENV_PATH}")
+        if not (in_venv or has_site_packages):
+            print(f"   Virtual environment not found: {VENV_PATH}")
+            print("   Re-run: scripts/install-mcp-wrapper.sh")
+        else:
+            print(f"   Expected location: {VENV_PATH}")
         print(f"\nTo install:")
         print(f"  cd <repo-directory>")
         print(f"  uv venv {VENV_PATH}")
@@ -10,137 +10,171 @@ Compares:
 import asyncio
 import os
 import sys
+from collections import Counter
+from itertools import islice
+from types import MappingProxyType
 
-from dotenv import load_dotenv
+# Load .env next to this script (dotenv is only imported when the file
+# exists), then keep a read-only snapshot of the environment
+_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if os.path.exists(_ENV_FILE):
+    from dotenv import load_dotenv
 
-load_dotenv()
+    load_dotenv(_ENV_FILE)
+ENV = MappingProxyType(dict(os.environ))
 
 from mcp_server.patterns import COMMON_BOT_AUTHORS
-from mcp_server.tools import fetch_pr_comments
+from mcp_server.tools import fetch_all_comment_contexts, fetch_pr_comments
 from mcp_server.tools.smart_analysis import (
     analyze_comment_smart,
     get_bot_comment_filters,
 )
+from mcp_server.utils import run_async
+
+# Maximum number of comments analyzed at once
+ANALYSIS_CONCURRENCY = 10
+
+# Constant for the whole run, so built once at import
+_SORTED_BOTS = tuple(sorted(COMMON_BOT_AUTHORS))
+_BOT_FILTERS = get_bot_comment_filters()
+
+# Section and sub-section separators
+_SEP = "=" * 80
+_SUB = "─" * 80
+
+
+async def analyze_all(comments, pr_number, repo):
+    """Run smart analysis on comments concurrently; failures are returned as exceptions"""
+    # Prefetch every comment's code context in one pass; if that fails, each
+    # analysis fetches its own context and reports its own error
+    try:
+        contexts = await fetch_all_comment_contexts(pr_number=pr_number, repo=repo)
+    except Exception as e:
+        print(f"⚠️  Context prefetch failed, fetching per comment: {e}")
+        contexts = {}
+    sem = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+    async def one(comment):
+        async with sem:
+            return await analyze_comment_smart(
+                comment_id=comment['id'],
+                pr_number=pr_number,
+                repo=repo,
+                comment_body=comment['body'],
+                context=contexts.get(comment['id'])
+            )
+
+    return await asyncio.gather(*(one(c) for c in comments), return_exceptions=True)
 
 
 async def main():
-    print("=" * 80)
+    print(_SEP)
     print("Phase 1.5: Smart Pattern Analysis Test")
-    print("=" * 80)
+    print(_SEP)
     print("\nPR: https://github.com/enverus-nv/genai-idp/pull/72\n")
 
     repo = "enverus-nv/genai-idp"
     pr_number = 72
 
     # Check auth
-    if not os.getenv("GITHUB_TOKEN"):
+    if not ENV.get("GITHUB_TOKEN"):
         print("❌ ERROR: GITHUB_TOKEN not set!")
         sys.exit(1)
 
     # Step 1: Show enhanced bot detection
-    print("\n" + "=" * 80)
+    print("\n" + _SEP)
     print("STEP 1: Enhanced Bot Detection")
-    print("=" * 80)
+    print(_SEP)
 
     print(f"\nRegistered bot authors ({len(COMMON_BOT_AUTHORS)}):")
-    for bot in sorted(COMMON_BOT_AUTHORS):
+    for bot in _SORTED_BOTS:
         print(f"  - {bot}")
 
     # Fetch with new filters
     print("\nFetching bot comments with enhanced filters...")
-    bot_filters = get_bot_comment_filters()
     bot_comments = await fetch_pr_comments(
         pr_number=pr_number,
         repo=repo,
-        filters=bot_filters
+        filters=_BOT_FILTERS
     )
 
     print(f"\n✅ Found {len(bot_comments)} bot comments")
 
     if bot_comments:
-        authors_found = {c['author'] for c in bot_comments}
+        author_counts = Counter(c['author'] for c in bot_comments)
         print("\nBot authors found:")
-        for author in sorted(authors_found):
-            count = sum(1 for c in bot_comments if c['author'] == author)
+        for author, count in sorted(author_counts.items()):
             print(f"  - {author}: {count} comments")
 
     # Step 2: Smart analysis on specific comments
-    print("\n" + "=" * 80)
+    print("\n" + _SEP)
     print("STEP 2: Smart Pattern Analysis")
-    print("=" * 80)
-
-    # Analyze first few comments
-    for i, comment in enumerate(bot_comments[:5], 1):
-        print(f"\n{'─' * 80}")
-        print(f"Comment #{i}: {comment['id']}")
-        print(f"{'─' * 80}")
-        print(f"Author: {comment['author']}")
-        print(f"File: {comment.get('file_path', 'N/A')}:{comment.get('line_number', 'N/A')}")
-        print(f"\nBody: {comment['body'][:150]}...")
-
-        # Run smart analysis
-        try:
-            analysis = await analyze_comment_smart(
-                comment_id=comment['id'],
-                pr_number=pr_number,
-                repo=repo
-            )
-
-            print("\n📊 SMART ANALYSIS:")
-            print(f"  Status: {analysis['status']}")
-            print(f"  Confidence: {analysis['confidence']:.2f}")
-            print(f"  Pattern: {analysis.get('pattern_detected', 'None')}")
-            print(f"  Can Auto-Fix: {analysis.get('can_auto_fix', False)}")
-
-            print(f"\n  Reasoning: {analysis['reasoning']}")
-            print(f"  Action: {analysis['suggested_action']}")
+    print(_SEP)
+
+    # Analyze every bot comment once; later steps reuse these results
+    analyses = dict(zip(
+        (c['id'] for c in bot_comments),
+        await analyze_all(bot_comments, pr_number, repo),
+        strict=True,
+    ))
+
+    # Show first few comments
+    for i, comment in enumerate(islice(bot_comments, 5), 1):
+        analysis = analyses[comment['id']]
+        # Build each comment's block and write it with a single print
+        lines = [
+            "\n" + _SUB,
+            f"Comment #{i}: {comment['id']}",
+            _SUB,
+            f"Author: {comment['author']}",
+            f"File: {comment.get('file_path', 'N/A')}:{comment.get('line_number', 'N/A')}",
+            f"\nBody: {comment['body'][:150]}...",
+        ]
+
+        if isinstance(analysis, Exception):
+            lines.append(f"\n⚠️  Analysis error: {analysis}")
+        else:
+            lines += [
+                "\n📊 SMART ANALYSIS:",
+                f"  Status: {analysis['status']}",
+                f"  Confidence: {analysis['confidence']:.2f}",
+                f"  Pattern: {analysis.get('pattern_detected', 'None')}",
+                f"  Can Auto-Fix: {analysis.get('can_auto_fix', False)}",
+                f"\n  Reasoning: {analysis['reasoning']}",
+                f"  Action: {analysis['suggested_action']}",
+            ]
 
             # Show suggested fix if available
             if analysis.get('suggested_fix'):
                 fix = analysis['suggested_fix']
-                print("\n  💡 SUGGESTED FIX:")
-                print(f"     Original: {fix['original']}")
-                print(f"     Fixed:    {fix['fixed']}")
-                print(f"     Explanation: {fix['explanation']}")
+                lines += [
+                    "\n  💡 SUGGESTED FIX:",
+                    f"     Original: {fix['original']}",
+                    f"     Fixed:    {fix['fixed']}",
+                    f"     Explanation: {fix['explanation']}",
+                ]
 
             # Show reply template
             if analysis.get('reply_template'):
-                print("\n  📝 REPLY TEMPLATE:")
-                print(f"     {analysis['reply_template']}")
+                lines += [
+                    "\n  📝 REPLY TEMPLATE:",
+                    f"     {analysis['reply_template']}",
+                ]
 
-        except Exception as e:
-            print(f"\n⚠️  Analysis error: {e}")
+        print("\n".join(lines))
 
     # Step 3: Statistics comparison
-    print("\n" + "=" * 80)
+    print("\n" + _SEP)
     print("STEP 3: Phase 1 vs Phase 1.5 Comparison")
-    print("=" * 80)
+    print(_SEP)
 
     # Analyze all bot comments
-    high_confidence = 0
-    auto_fixable = 0
-    patterns_detected = {}
-
-    for comment in bot_comments:
-        try:
-            analysis = await analyze_comment_smart(
-                comment_id=comment['id'],
-                pr_number=pr_number,
-                repo=repo
-            )
-
-            if analysis['confidence'] >= 0.7:
-                high_confidence += 1
-
-            if analysis.get('can_auto_fix'):
-                auto_fixable += 1
-
-            pattern = analysis.get('pattern_detected')
-            if pattern:
-                patterns_detected[pattern] = patterns_detected.get(pattern, 0) + 1
-
-        except Exception:
-            pass
+    succeeded = [a for a in analyses.values() if not isinstance(a, Exception)]
+    high_confidence = sum(1 for a in succeeded if a['confidence'] >= 0.7)
+    auto_fixable = sum(1 for a in succeeded if a.get('can_auto_fix'))
+    patterns_detected = Counter(
+        a['pattern_detected'] for a in succeeded if a.get('pattern_detected')
+    )
 
     print("\nPHASE 1 (Heuristic):")
     print(f"  - High Confidence (>0.7): 0 / {len(bot_comments)} (0%)")
@@ -155,26 +189,21 @@ async def main():
         print(f"      • {pattern}: {count}")
 
     # Step 4: Actionable summary
-    print("\n" + "=" * 80)
+    print("\n" + _SEP)
     print("ACTIONABLE SUMMARY")
-    print("=" * 80)
+    print(_SEP)
 
     fixable_comments = []
     for comment in bot_comments:
-        try:
-            analysis = await analyze_comment_smart(
-                comment_id=comment['id'],
-                pr_number=pr_number,
-                repo=repo
-            )
+        analysis = analyses[comment['id']]
+        if isinstance(analysis, Exception):
+            continue
 
-            if analysis.get('can_auto_fix') and analysis['confidence'] >= 0.7:
-                fixable_comments.append({
-                    'comment': comment,
-                    'analysis': analysis
-                })
-        except Exception:
-            pass
+        if analysis.get('can_auto_fix') and analysis['confidence'] >= 0.7:
+            fixable_comments.append({
+                'comment': comment,
+                'analysis': analysis
+            })
 
     print(f"\n✅ {len(fixable_comments)} comments can be auto-fixed with high confidence:\n")
 
@@ -182,22 +211,24 @@ async def main():
         comment = item['comment']
         analysis = item['analysis']
 
-        print(f"📌 Comment {comment['id']}:")
-        print(f"   File: {comment.get('file_path', 'N/A')}:{comment.get('line_number', 'N/A')}")
-        print(f"   Pattern: {analysis.get('pattern_detected')}")
-        print(f"   Confidence: {analysis['confidence']:.2f}")
+        lines = [
+            f"📌 Comment {comment['id']}:",
+            f"   File: {comment.get('file_path', 'N/A')}:{comment.get('line_number', 'N/A')}",
+            f"   Pattern: {analysis.get('pattern_detected')}",
+            f"   Confidence: {analysis['confidence']:.2f}",
+        ]
 
         if analysis.get('suggested_fix'):
             fix = analysis['suggested_fix']
-            print(f"   Fix: {fix['explanation']}")
+            lines.append(f"   Fix: {fix['explanation']}")
 
         if analysis.get('reply_template'):
-            print(f"   Reply: {analysis['reply_template'][:60]}...")
-        print()
+            lines.append(f"   Reply: {analysis['reply_template'][:60]}...")
+        print("\n".join(lines) + "\n")
 
-    print("=" * 80)
+    print(_SEP)
     print("🎉 Phase 1.5 Test Complete!")
-    print("=" * 80)
+    print(_SEP)
 
     print(f"""
 Key Improvements:
@@ -215,4 +246,4 @@ Next steps:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -12,11 +12,18 @@ This script will:
 import asyncio
 import os
 import sys
+from collections import Counter
+from itertools import islice
+from types import MappingProxyType
 
-from dotenv import load_dotenv
+# Load .env next to this script (dotenv is only imported when the file
+# exists), then keep a read-only snapshot of the environment
+_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if os.path.exists(_ENV_FILE):
+    from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+    load_dotenv(_ENV_FILE)
+ENV = MappingProxyType(dict(os.environ))
 
 # Import MCP tools
 from mcp_server.tools import (
@@ -25,13 +32,18 @@ from mcp_server.tools import (
     fetch_pr_comments,
     get_comment_context,
 )
+from mcp_server.utils import run_async
+
+# Section and sub-section separators
+_SEP = "=" * 80
+_SUB = "─" * 80
 
 
 async def main():
     """Test on real PR"""
-    print("=" * 80)
+    print(_SEP)
     print("Testing GitHub PR Comment Agent on Real PR")
-    print("=" * 80)
+    print(_SEP)
     print("\nPR: https://github.com/enverus-nv/genai-idp/pull/72")
 
     # Configuration
@@ -39,7 +51,7 @@ async def main():
     pr_number = 72
 
     # Check environment
-    github_token = os.getenv("GITHUB_TOKEN")
+    github_token = ENV.get("GITHUB_TOKEN")
     if not github_token:
         print("\n❌ ERROR: GITHUB_TOKEN not set!")
         print("   Please set GITHUB_TOKEN in .env file")
@@ -51,9 +63,9 @@ async def main():
 
     try:
         # Step 1: Fetch ALL comments
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 1: Fetching all comments from PR")
-        print("=" * 80)
+        print(_SEP)
 
         all_comments = await fetch_pr_comments(
             pr_number=pr_number,
@@ -68,19 +80,16 @@ async def main():
             return
 
         # Show comment breakdown by author
-        authors = {}
-        for comment in all_comments:
-            author = comment['author']
-            authors[author] = authors.get(author, 0) + 1
+        authors = Counter(comment['author'] for comment in all_comments)
 
         print("\nComments by author:")
-        for author, count in sorted(authors.items(), key=lambda x: x[1], reverse=True):
+        for author, count in authors.most_common():
             print(f"  - {author}: {count}")
 
         # Step 2: Fetch bot comments specifically
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 2: Fetching bot comments (Copilot, etc.)")
-        print("=" * 80)
+        print(_SEP)
 
         bot_authors = [
             "github-copilot",
@@ -99,39 +108,46 @@ async def main():
 
         if bot_comments:
             print("\nBot comments:")
-            for comment in bot_comments[:5]:  # Show first 5
-                print(f"\n  ID: {comment['id']}")
-                print(f"  Author: {comment['author']}")
-                print(f"  File: {comment['file_path']}:{comment['line_number']}")
-                print(f"  Body: {comment['body'][:100]}...")
+            for comment in islice(bot_comments, 5):  # Show first 5
+                print(
+                    f"\n  ID: {comment['id']}\n"
+                    f"  Author: {comment['author']}\n"
+                    f"  File: {comment['file_path']}:{comment['line_number']}\n"
+                    f"  Body: {comment['body'][:100]}..."
+                )
 
         # Step 3: Show first few comments in detail
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 3: Detailed view of first 3 comments")
-        print("=" * 80)
-
-        for i, comment in enumerate(all_comments[:3], 1):
-            print(f"\n{'─' * 80}")
-            print(f"Comment #{i}")
-            print(f"{'─' * 80}")
-            print(f"ID: {comment['id']}")
-            print(f"Author: {comment['author']}")
-            print(f"Type: {comment['comment_type']}")
-            print(f"Status: {comment['status']}")
-            print(f"Created: {comment['created_at']}")
+        print(_SEP)
+
+        for i, comment in enumerate(islice(all_comments, 3), 1):
+            # Build each comment's block and write it with a single print
+            lines = [
+                "\n" + _SUB,
+                f"Comment #{i}",
+                _SUB,
+                f"ID: {comment['id']}",
+                f"Author: {comment['author']}",
+                f"Type: {comment['comment_type']}",
+                f"Status: {comment['status']}",
+                f"Created: {comment['created_at']}",
+            ]
 
             if comment.get('file_path'):
-                print(f"Location: {comment['file_path']}:{comment['line_number']}")
+                lines.append(f"Location: {comment['file_path']}:{comment['line_number']}")
 
-            print(f"\nBody:\n{comment['body']}")
+            lines.append(f"\nBody:\n{comment['body']}")
 
             if comment.get('diff_hunk'):
-                print(f"\nDiff Hunk:\n{comment['diff_hunk']}")
+                lines.append(f"\nDiff Hunk:\n{comment['diff_hunk']}")
+
+            print("\n".join(lines))
 
         # Step 4: Get context for first comment with a file location
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 4: Get code context for a comment")
-        print("=" * 80)
+        print(_SEP)
 
         # Find first comment with file location
         comment_with_file = next(
@@ -144,45 +160,49 @@ async def main():
             print(f"File: {comment_with_file['file_path']}")
             print(f"Line: {comment_with_file['line_number']}")
 
-            try:
-                context = await get_comment_context(
+            # Fetch context and validity analysis (step 5) concurrently
+            context, analysis = await asyncio.gather(
+                get_comment_context(
                     comment_id=comment_with_file['id'],
                     pr_number=pr_number,
                     repo=repo,
                     lines_before=10,
                     lines_after=10
-                )
+                ),
+                analyze_comment_validity(
+                    comment_id=comment_with_file['id'],
+                    pr_number=pr_number,
+                    repo=repo
+                ),
+                return_exceptions=True,
+            )
 
+            if isinstance(context, Exception):
+                print(f"\n⚠️  Could not get context: {context}")
+            else:
                 print("\n✅ Code context retrieved")
                 print("\nCode snippet:")
                 print(context['code_snippet'])
 
                 if context.get('related_changes'):
                     print("\nRelated changes in PR:")
-                    for change in context['related_changes'][:5]:
+                    for change in islice(context['related_changes'], 5):
                         print(f"  - {change}")
-
-            except Exception as e:
-                print(f"\n⚠️  Could not get context: {e}")
         else:
             print("\nNo comments with file locations found")
 
         # Step 5: Analyze validity of comments
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 5: Analyze comment validity")
-        print("=" * 80)
+        print(_SEP)
 
         # Analyze first comment with file location
         if comment_with_file:
             print(f"\nAnalyzing comment {comment_with_file['id']}...")
 
-            try:
-                analysis = await analyze_comment_validity(
-                    comment_id=comment_with_file['id'],
-                    pr_number=pr_number,
-                    repo=repo
-                )
-
+            if isinstance(analysis, Exception):
+                print(f"\n⚠️  Could not analyze: {analysis}")
+            else:
                 print("\n✅ Analysis complete")
                 print(f"\nStatus: {analysis['status']}")
                 print(f"Is Valid: {analysis['is_valid']}")
@@ -190,13 +210,10 @@ async def main():
                 print(f"\nReasoning: {analysis['reasoning']}")
                 print(f"\nSuggested Action: {analysis['suggested_action']}")
 
-            except Exception as e:
-                print(f"\n⚠️  Could not analyze: {e}")
-
         # Step 6: Batch analysis
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("STEP 6: Batch analysis and categorization")
-        print("=" * 80)
+        print(_SEP)
 
         print(f"\nAnalyzing all {len(all_comments)} comments...")
 
@@ -217,16 +234,13 @@ async def main():
         ):
             print(f"  - {category}: {count}")
 
-        # Show priorities
-        high_priority = [
-            p for p in batch_result['priorities'] if p['priority'] == 'high'
-        ]
-        medium_priority = [
-            p for p in batch_result['priorities'] if p['priority'] == 'medium'
-        ]
-        low_priority = [
-            p for p in batch_result['priorities'] if p['priority'] == 'low'
-        ]
+        # Show priorities (bucketed in one pass)
+        buckets = {'high': [], 'medium': [], 'low': []}
+        for p in batch_result['priorities']:
+            buckets.setdefault(p['priority'], []).append(p)
+        high_priority = buckets['high']
+        medium_priority = buckets['medium']
+        low_priority = buckets['low']
 
         print("\nPriorities:")
         print(f"  - High: {len(high_priority)}")
@@ -235,18 +249,21 @@ async def main():
 
         if high_priority:
             print("\nHigh Priority Comments:")
-            for p in high_priority[:5]:
-                print(f"\n  Comment ID: {p['comment_id']}")
-                print(f"  Author: {p['author']}")
-                print(f"  Category: {p['category']}")
+            for p in islice(high_priority, 5):
+                lines = [
+                    f"\n  Comment ID: {p['comment_id']}",
+                    f"  Author: {p['author']}",
+                    f"  Category: {p['category']}",
+                ]
                 if p.get('file_path'):
-                    print(f"  Location: {p['file_path']}:{p['line_number']}")
-                print(f"  Preview: {p['preview'][:100]}...")
+                    lines.append(f"  Location: {p['file_path']}:{p['line_number']}")
+                lines.append(f"  Preview: {p['preview'][:100]}...")
+                print("\n".join(lines))
 
         # Summary
-        print("\n" + "=" * 80)
+        print("\n" + _SEP)
         print("SUMMARY")
-        print("=" * 80)
+        print(_SEP)
 
         print(f"""
 Total Comments: {len(all_comments)}
@@ -259,7 +276,7 @@ Categories:
 {chr(10).join(f"  - {cat}: {count}" for cat, count in batch_result['categories'].items())}
 
 Top Authors:
-{chr(10).join(f"  - {author}: {count}" for author, count in sorted(authors.items(), key=lambda x: x[1], reverse=True)[:5])}
+{chr(10).join(f"  - {author}: {count}" for author, count in authors.most_common(5))}
 """)
 
         print("\n✅ Test completed successfully!")
@@ -272,4 +289,4 @@ Top Authors:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
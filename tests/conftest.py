@@ -0,0 +1,30 @@
+"""
+Shared pytest fixtures
+"""
+import json
+from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def sample_thread_data():
+    """Load sample thread data from fixtures once per session (read-only)"""
+    return MappingProxyType(json.loads((FIXTURES_DIR / "sample_threads.json").read_bytes()))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _patched_github():
+    """Replace PyGithub's client for the whole session so no test builds a real one"""
+    with patch("mcp_server.tools.github_api.Github") as mock_github:
+        yield mock_github
+
+
+@pytest.fixture(scope="session")
+def sample_thread_graphql_response(sample_thread_data):
+    """The "data" payload of the sample threads, as returned by _graphql_query"""
+    return sample_thread_data["data"]
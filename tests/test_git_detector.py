@@ -0,0 +1,107 @@
+"""
+Unit tests for git repository detection
+
+Tests parse_github_url() URL formats and the caching in detect_github_repo().
+"""
+import subprocess
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_server.utils import git_detector
+from mcp_server.utils.git_detector import detect_github_repo, parse_github_url
+
+
+class TestParseGithubUrl:
+    """Test parse_github_url()"""
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://github.com/owner/repo.git", "owner/repo"),
+            ("https://github.com/owner/repo", "owner/repo"),
+            ("https://github.com/owner/repo/", "owner/repo"),
+            ("http://github.com/owner/repo", "owner/repo"),
+            ("git@github.com:owner/repo.git", "owner/repo"),
+            ("git@github.com:owner/repo", "owner/repo"),
+            ("github.com:owner/repo.git", "owner/repo"),
+            ("https://github.com/my-org/my.repo.git", "my-org/my.repo"),
+            ("https://github.com/owner/repo.git/", "owner/repo"),
+            ("https://github.com/owner/repo/tree/main", "owner/repo"),
+            ("https://github.com/owner", None),
+            ("https://gitlab.com/owner/repo.git", None),
+            ("", None),
+        ],
+    )
+    def test_parse_github_url(self, url, expected):
+        """Test HTTPS, SSH and short SSH remote formats"""
+        assert parse_github_url(url) == expected
+
+
+class TestDetectGithubRepo:
+    """Test detect_github_repo()"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Clear the detection cache before and after each test"""
+        git_detector._repo_by_cwd.clear()
+        yield
+        git_detector._repo_by_cwd.clear()
+
+    def test_detect_reads_git_config(self, tmp_path, monkeypatch):
+        """Test that the origin URL is read from .git/config without running git"""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        (git_dir / "config").write_text(
+            "[core]\n"
+            "\tbare = false\n"
+            '[remote "origin"]\n'
+            "\turl = https://github.com/owner/repo.git\n"
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
+        )
+        subdir = tmp_path / "src" / "pkg"
+        subdir.mkdir(parents=True)
+        monkeypatch.chdir(subdir)
+
+        with patch("mcp_server.utils.git_detector.subprocess.run") as mock_run:
+            assert detect_github_repo() == "owner/repo"
+            mock_run.assert_not_called()
+
+    def test_detect_is_cached(self, tmp_path, monkeypatch):
+        """Test that the git remote is only looked up once per directory"""
+        monkeypatch.chdir(tmp_path)
+
+        with patch("mcp_server.utils.git_detector.subprocess.run") as mock_run:
+            mock_run.return_value = Mock(stdout="git@github.com:owner/repo.git\n")
+
+            assert detect_github_repo() == "owner/repo"
+            assert detect_github_repo() == "owner/repo"
+
+            mock_run.assert_called_once()
+
+    def test_detect_failure_is_not_cached(self, tmp_path, monkeypatch):
+        """Test that a failed lookup is retried, e.g. once origin is configured"""
+        monkeypatch.chdir(tmp_path)
+
+        with patch("mcp_server.utils.git_detector.subprocess.run") as mock_run:
+            mock_run.side_effect = [
+                subprocess.CalledProcessError(2, "git"),
+                Mock(stdout="https://github.com/owner/repo.git\n"),
+            ]
+
+            assert detect_github_repo() is None
+            assert detect_github_repo() == "owner/repo"
+            assert mock_run.call_count == 2
+
+    def test_detect_not_a_git_repo(self, tmp_path, monkeypatch):
+        """Test that a failing git command returns None"""
+        monkeypatch.chdir(tmp_path)
+
+        with patch("mcp_server.utils.git_detector.subprocess.run") as mock_run:
+            mock_run.side_effect = subprocess.CalledProcessError(128, "git")
+
+            assert detect_github_repo() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
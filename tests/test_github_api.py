@@ -3,69 +3,190 @@ Unit tests for GitHub API client
 
 Tests all functions in mcp_server/tools/github_api.py with mocked GitHub API responses.
 """
-import json
+import copy
 import os
-import subprocess
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
+import httpx
 import pytest
-from github.PullRequestComment import PullRequestComment
-
-# Add parent directory to path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from github import GithubRetry
 
 from mcp_server.models import CommentStatus
-from mcp_server.tools.github_api import GitHubAPIClient
-
-
-@pytest.fixture
+from mcp_server.tools import github_api
+from mcp_server.tools.github_api import (
+    GRAPHQL_URL,
+    PAGE_SIZE,
+    POOL_SIZE,
+    GitHubAPIClient,
+    _github_by_token,
+)
+from mcp_server.tools.interactive import _ANALYSIS_CONCURRENCY
+
+
+@pytest.fixture(scope="session")
 def mock_github_token():
     """Provide a test GitHub token"""
     return "test_token_12345"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_repo_name():
     """Provide a test repository name"""
     return "test-owner/test-repo"
 
 
-@pytest.fixture
-def client(mock_github_token, mock_repo_name):
-    """Create a GitHubAPIClient instance with mocked Github client"""
-    with patch("mcp_server.tools.github_api.Github"):
-        client = GitHubAPIClient(token=mock_github_token, repo=mock_repo_name)
-        return client
+@pytest.fixture(scope="session")
+def session_client(mock_github_token, mock_repo_name):
+    """Create one GitHubAPIClient per session (Github is patched in conftest)"""
+    return GitHubAPIClient(token=mock_github_token, repo=mock_repo_name)
 
 
 @pytest.fixture
-def mock_review_comment():
-    """Create a mock review comment"""
-    comment = Mock(spec=PullRequestComment)
-    comment.id = 12345
-    comment.user = Mock()
-    comment.user.login = "test-user"
-    comment.body = "This is a test comment"
-    comment.created_at = "2025-01-01T00:00:00Z"
-    comment.updated_at = "2025-01-01T00:00:00Z"
-    comment.path = "test/file.py"
-    comment.line = 42
-    comment.original_line = 42
-    comment.diff_hunk = "@@ -40,3 +40,3 @@"
-    comment.url = "https://api.github.com/repos/test-owner/test-repo/pulls/comments/12345"
-    comment.html_url = "https://github.com/test-owner/test-repo/pull/1#discussion_r12345"
-    comment.pull_request_url = "https://api.github.com/repos/test-owner/test-repo/pulls/1"
-    return comment
+def client(session_client):
+    """Provide the shared client with its per-test state reset"""
+    session_client._thread_status_cache.clear()
+    session_client._comment_index.clear()
+    session_client._repo = None
+    return session_client
+
+
+# Patch target for the shared HTTP client and canned GraphQL HTTP responses
+_HTTP_CLIENT = "mcp_server.tools.github_api._get_http_client"
+_GRAPHQL_REQUEST = httpx.Request("POST", GRAPHQL_URL)
+_OK_RESPONSE = {"data": {"repository": {"name": "test-repo"}}}
+_ERR_RESPONSE = {"errors": [{"message": "Field 'invalid' doesn't exist"}]}
+_AUTH_FAILED = httpx.Response(401, text="Authentication failed", request=_GRAPHQL_REQUEST)
+
+# GraphQL response for a PR without review threads
+_NO_THREADS = {"repository": {"pullRequest": {"reviewThreads": {"nodes": []}}}}
+
+# GraphQL responses for a PR whose only thread holds comment 12345
+_QUERY_OPEN = {
+    "repository": {
+        "pullRequest": {
+            "reviewThreads": {
+                "nodes": [
+                    {
+                        "id": "PRRT_test",
+                        "isResolved": False,
+                        "comments": {"nodes": [{"databaseId": 12345}]}
+                    }
+                ]
+            }
+        }
+    }
+}
+_QUERY_RESOLVED = {
+    "repository": {
+        "pullRequest": {
+            "reviewThreads": {
+                "nodes": [
+                    {
+                        "id": "PRRT_test",
+                        "isResolved": True,
+                        "comments": {"nodes": [{"databaseId": 12345}]}
+                    }
+                ]
+            }
+        }
+    }
+}
+_MUTATION_RESOLVED = {"resolveReviewThread": {"thread": {"id": "PRRT_test", "isResolved": True}}}
+
+
+def fake_graphql(response=None, error=None):
+    """Build a stand-in for _graphql_query/_graphql_mutation and the list of its calls"""
+    calls = []
+
+    def fake(query, variables=None):
+        calls.append((query, variables))
+        if error is not None:
+            raise error
+        return response
+
+    return fake, calls
+
+
+@pytest.fixture(scope="session")
+def review_comment_template():
+    """Build the review comment attributes once per session"""
+    return SimpleNamespace(
+        id=12345,
+        user=SimpleNamespace(login="test-user"),
+        body="This is a test comment",
+        created_at="2025-01-01T00:00:00Z",
+        updated_at="2025-01-01T00:00:00Z",
+        path="test/file.py",
+        line=42,
+        original_line=42,
+        diff_hunk="@@ -40,3 +40,3 @@",
+        url="https://api.github.com/repos/test-owner/test-repo/pulls/comments/12345",
+        html_url="https://github.com/test-owner/test-repo/pull/1#discussion_r12345",
+        pull_request_url="https://api.github.com/repos/test-owner/test-repo/pulls/1",
+    )
 
 
 @pytest.fixture
-def sample_thread_data():
-    """Load sample thread data from fixtures"""
-    fixture_path = Path(__file__).parent / "fixtures" / "sample_threads.json"
-    with open(fixture_path) as f:
-        return json.load(f)
+def mock_review_comment(review_comment_template):
+    """Create a review comment stand-in that tests may modify"""
+    return copy.copy(review_comment_template)
+
+
+class TestClientConfiguration:
+    """Test PyGithub client construction"""
+
+    def test_client_uses_max_page_size(self, mock_repo_name):
+        """Test that paginated calls fetch the maximum page size"""
+        _github_by_token.clear()
+
+        with patch("mcp_server.tools.github_api.Github") as mock_github:
+            GitHubAPIClient(token="page_size_token", repo=mock_repo_name)
+
+        _github_by_token.clear()
+        assert PAGE_SIZE == 100
+        assert mock_github.call_args.kwargs["per_page"] == PAGE_SIZE
+
+    def test_client_pool_covers_concurrency(self, mock_repo_name):
+        """Test that the connection pool is large enough for concurrent tool calls"""
+        _github_by_token.clear()
+
+        with patch("mcp_server.tools.github_api.Github") as mock_github:
+            GitHubAPIClient(token="pool_size_token", repo=mock_repo_name)
+
+        _github_by_token.clear()
+        assert POOL_SIZE >= _ANALYSIS_CONCURRENCY
+        assert mock_github.call_args.kwargs["pool_size"] == POOL_SIZE
+
+    def test_client_keeps_rate_limit_aware_retry(self, mock_repo_name):
+        """Test that retries use GithubRetry, which backs off on 403 rate limits"""
+        _github_by_token.clear()
+
+        with patch("mcp_server.tools.github_api.Github") as mock_github:
+            GitHubAPIClient(token="retry_token", repo=mock_repo_name)
+
+        _github_by_token.clear()
+        assert isinstance(mock_github.call_args.kwargs["retry"], GithubRetry)
+
+    def test_http_client_created_once_under_concurrency(self, monkeypatch):
+        """Test that concurrent first calls share one lazily created HTTP client"""
+        monkeypatch.setattr(github_api, "_http_client", None)
+        created = []
+
+        def slow_client(**kwargs):
+            time.sleep(0.01)  # Widen the window for a creation race
+            created.append(object())
+            return created[-1]
+
+        monkeypatch.setattr(github_api.httpx, "Client", slow_client)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: github_api._get_http_client(), range(8)))
+
+        assert len(created) == 1
+        assert all(c is created[0] for c in clients)
 
 
 class TestGraphQLMethods:
@@ -73,118 +194,102 @@ class TestGraphQLMethods:
 
     def test_graphql_query_success(self, client):
         """Test successful GraphQL query execution"""
-        mock_response = {
-            "data": {
-                "repository": {
-                    "name": "test-repo"
-                }
-            }
-        }
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout=json.dumps(mock_response),
-                returncode=0
-            )
+        mock_http = Mock()
+        mock_http.post.return_value = httpx.Response(200, json=_OK_RESPONSE, request=_GRAPHQL_REQUEST)
 
+        with patch(_HTTP_CLIENT, return_value=mock_http):
             result = client._graphql_query("{ repository { name } }")
 
-            assert result == mock_response["data"]
-            mock_run.assert_called_once()
+            assert result == _OK_RESPONSE["data"]
+            mock_http.post.assert_called_once()
+            assert mock_http.post.call_args.kwargs["headers"]["Authorization"] == "Bearer test_token_12345"
 
     def test_graphql_query_with_errors(self, client):
         """Test GraphQL query with errors in response"""
-        mock_response = {
-            "errors": [
-                {"message": "Field 'invalid' doesn't exist"}
-            ]
-        }
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout=json.dumps(mock_response),
-                returncode=0
-            )
+        mock_http = Mock()
+        mock_http.post.return_value = httpx.Response(200, json=_ERR_RESPONSE, request=_GRAPHQL_REQUEST)
 
+        with patch(_HTTP_CLIENT, return_value=mock_http):
             with pytest.raises(Exception, match="GraphQL query error"):
                 client._graphql_query("{ invalid }")
 
-    def test_graphql_query_subprocess_failure(self, client):
-        """Test GraphQL query when subprocess fails"""
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = subprocess.CalledProcessError(
-                1, "gh", stderr="Authentication failed"
-            )
+    def test_graphql_query_invalid_json(self, client):
+        """Test GraphQL query when the response body is not JSON"""
+        mock_http = Mock()
+        mock_http.post.return_value = httpx.Response(200, content=b"<html>", request=_GRAPHQL_REQUEST)
 
-            with pytest.raises(Exception, match="Failed to execute GraphQL query"):
+        with patch(_HTTP_CLIENT, return_value=mock_http):
+            with pytest.raises(Exception, match="Failed to parse GraphQL response"):
                 client._graphql_query("{ repository { name } }")
 
+    def test_graphql_query_http_failure(self, client):
+        """Test GraphQL query when the HTTP request fails"""
+        mock_http = Mock()
+        mock_http.post.return_value = _AUTH_FAILED
 
-class TestGetCommentStatus:
-    """Test _get_comment_status() method"""
-
-    def test_get_comment_status_open(self, client, mock_review_comment, sample_thread_data):
-        """Test getting status for an open comment"""
-        # Mock the comment to have ID from sample data (open thread)
-        mock_review_comment.id = 12345
-
-        with patch.object(client, "_graphql_query", return_value=sample_thread_data["data"]):
-            status = client._get_comment_status(mock_review_comment)
-
-            assert status == CommentStatus.OPEN
-
-    def test_get_comment_status_resolved(self, client, mock_review_comment, sample_thread_data):
-        """Test getting status for a resolved comment"""
-        # Mock the comment to have ID from sample data (resolved thread)
-        mock_review_comment.id = 67890
+        with patch(_HTTP_CLIENT, return_value=mock_http):
+            with pytest.raises(Exception, match="Failed to execute GraphQL query: Authentication failed"):
+                client._graphql_query("{ repository { name } }")
 
-        with patch.object(client, "_graphql_query", return_value=sample_thread_data["data"]):
-            status = client._get_comment_status(mock_review_comment)
 
-            assert status == CommentStatus.RESOLVED
+class TestGetCommentStatus:
+    """Test _get_comment_status() method"""
 
-    def test_get_comment_status_caching(self, client, mock_review_comment, sample_thread_data):
+    @pytest.mark.parametrize(
+        "comment_id,response,error,expected",
+        [
+            (12345, "sample", None, CommentStatus.OPEN),
+            (67890, "sample", None, CommentStatus.RESOLVED),
+            # Not in any thread - defaults to OPEN
+            (99999, _NO_THREADS, None, CommentStatus.OPEN),
+            # GraphQL failure - falls back to OPEN
+            (12345, None, Exception("API error"), CommentStatus.OPEN),
+        ],
+        ids=["open", "resolved", "not_found", "graphql_failure"],
+    )
+    def test_get_comment_status(
+        self, client, mock_review_comment, sample_thread_graphql_response, monkeypatch,
+        comment_id, response, error, expected,
+    ):
+        """Test status lookup for open, resolved, missing and failed cases"""
+        mock_review_comment.id = comment_id
+        if response == "sample":
+            response = sample_thread_graphql_response
+        fake, _ = fake_graphql(response, error)
+        monkeypatch.setattr(client, "_graphql_query", fake)
+
+        assert client._get_comment_status(mock_review_comment) == expected
+
+    def test_get_comment_status_caching(self, client, mock_review_comment, sample_thread_graphql_response, monkeypatch):
         """Test that comment status is cached"""
         mock_review_comment.id = 12345
+        fake, calls = fake_graphql(sample_thread_graphql_response)
+        monkeypatch.setattr(client, "_graphql_query", fake)
 
-        with patch.object(client, "_graphql_query", return_value=sample_thread_data["data"]) as mock_query:
-            # First call - should query GraphQL
-            status1 = client._get_comment_status(mock_review_comment)
-
-            # Second call - should use cache
-            status2 = client._get_comment_status(mock_review_comment)
+        # First call - should query GraphQL
+        status1 = client._get_comment_status(mock_review_comment)
 
-            assert status1 == status2
-            # GraphQL should only be called once
-            assert mock_query.call_count == 1
+        # Second call - should use cache
+        status2 = client._get_comment_status(mock_review_comment)
 
-    def test_get_comment_status_not_found(self, client, mock_review_comment):
-        """Test getting status for comment not in any thread"""
-        mock_review_comment.id = 99999  # Not in threads
+        assert status1 == status2
+        # GraphQL should only be called once
+        assert len(calls) == 1
 
-        mock_data = {
-            "repository": {
-                "pullRequest": {
-                    "reviewThreads": {
-                        "nodes": []
-                    }
-                }
-            }
-        }
-
-        with patch.object(client, "_graphql_query", return_value=mock_data):
-            status = client._get_comment_status(mock_review_comment)
+    def test_get_comment_status_caches_whole_pr(self, client, mock_review_comment, sample_thread_graphql_response, monkeypatch):
+        """Test that one query caches the status of every comment in the PR"""
+        mock_review_comment.id = 12345
+        fake, calls = fake_graphql(sample_thread_graphql_response)
+        monkeypatch.setattr(client, "_graphql_query", fake)
 
-            # Should default to OPEN if not found
-            assert status == CommentStatus.OPEN
+        client._get_comment_status(mock_review_comment)
 
-    def test_get_comment_status_graphql_failure(self, client, mock_review_comment):
-        """Test fallback behavior when GraphQL fails"""
-        with patch.object(client, "_graphql_query", side_effect=Exception("API error")):
-            status = client._get_comment_status(mock_review_comment)
+        # Another comment from the same PR should come from the cache
+        mock_review_comment.id = 67890
+        status = client._get_comment_status(mock_review_comment)
 
-            # Should fall back to OPEN on error
-            assert status == CommentStatus.OPEN
+        assert status == CommentStatus.RESOLVED
+        assert len(calls) == 1
 
 
 class TestCreateCommentReply:
@@ -202,6 +307,7 @@ class TestCreateCommentReply:
         mock_review_comment.id = 12345
 
         mock_pr.get_review_comments.return_value = [mock_review_comment]
+        mock_pr.get_issue_comments.return_value = []
         mock_pr.create_review_comment_reply.return_value = mock_reply
 
         with patch.object(client, "get_pull_request", return_value=mock_pr):
@@ -258,144 +364,130 @@ class TestCreateCommentReply:
                     body="Test reply"
                 )
 
+    def test_create_comment_reply_uses_comment_index(self, client):
+        """Test that comments indexed by get_all_pr_comments skip the lookup"""
+        mock_pr = Mock()
+        mock_reply = Mock()
+        mock_reply.id = 99999
+        mock_reply.html_url = "https://github.com/test/test/pull/1#discussion_r99999"
+        mock_reply.body = "Test reply"
+        mock_pr.create_review_comment_reply.return_value = mock_reply
 
-class TestResolveThread:
-    """Test resolve_thread() method"""
+        client._index_comments(1, [Mock(id=12345)], [])
 
-    def test_resolve_thread_success(self, client):
-        """Test successfully resolving an open thread"""
-        # Mock query response (thread is open)
-        query_response = {
-            "repository": {
-                "pullRequest": {
-                    "reviewThreads": {
-                        "nodes": [
-                            {
-                                "id": "PRRT_test",
-                                "isResolved": False,
-                                "comments": {
-                                    "nodes": [{"databaseId": 12345}]
-                                }
-                            }
-                        ]
-                    }
-                }
-            }
-        }
+        with patch.object(client, "get_pull_request", return_value=mock_pr):
+            result = client.create_comment_reply(
+                comment_id="12345",
+                pr_number=1,
+                body="Test reply"
+            )
 
-        # Mock mutation response (thread now resolved)
-        mutation_response = {
-            "resolveReviewThread": {
-                "thread": {
-                    "id": "PRRT_test",
-                    "isResolved": True
-                }
-            }
-        }
+            assert result["type"] == "review_comment_reply"
+            mock_pr.get_review_comments.assert_not_called()
+            mock_pr.get_issue_comments.assert_not_called()
 
-        with patch.object(client, "_graphql_query", return_value=query_response):
-            with patch.object(client, "_graphql_mutation", return_value=mutation_response):
-                result = client.resolve_thread(
-                    comment_id="12345",
-                    pr_number=1
+    def test_create_comment_reply_invalid_id(self, client):
+        """Test error when comment ID is not numeric"""
+        with patch.object(client, "get_pull_request") as mock_get_pr:
+            with pytest.raises(ValueError, match="Invalid comment_id"):
+                client.create_comment_reply(
+                    comment_id="not-a-number",
+                    pr_number=1,
+                    body="Test reply"
                 )
 
-                assert result["status"] == "resolved"
-                assert result["is_resolved"] is True
-                assert result["thread_id"] == "PRRT_test"
+            # Should fail before any API call
+            mock_get_pr.assert_not_called()
 
-    def test_resolve_thread_already_resolved(self, client):
-        """Test resolving a thread that's already resolved"""
-        query_response = {
-            "repository": {
-                "pullRequest": {
-                    "reviewThreads": {
-                        "nodes": [
-                            {
-                                "id": "PRRT_test",
-                                "isResolved": True,  # Already resolved
-                                "comments": {
-                                    "nodes": [{"databaseId": 12345}]
-                                }
-                            }
-                        ]
-                    }
-                }
-            }
-        }
-
-        with patch.object(client, "_graphql_query", return_value=query_response):
-            result = client.resolve_thread(
-                comment_id="12345",
-                pr_number=1
-            )
 
-            assert result["status"] == "already_resolved"
-            assert result["is_resolved"] is True
+class TestResolveThread:
+    """Test resolve_thread() method"""
 
-    def test_resolve_thread_not_found(self, client):
-        """Test error when comment's thread not found"""
-        query_response = {
-            "repository": {
-                "pullRequest": {
-                    "reviewThreads": {
-                        "nodes": []
-                    }
-                }
-            }
+    @pytest.mark.parametrize(
+        "query_response,expected",
+        [
+            (_QUERY_OPEN, {"status": "resolved", "is_resolved": True, "thread_id": "PRRT_test"}),
+            (_QUERY_RESOLVED, {"status": "already_resolved", "is_resolved": True}),
+        ],
+        ids=["open", "already_resolved"],
+    )
+    def test_resolve_thread(self, client, monkeypatch, query_response, expected):
+        """Test resolving an open thread and one that is already resolved"""
+        fake_query, query_calls = fake_graphql(query_response)
+        fake_mutation, _ = fake_graphql(_MUTATION_RESOLVED)
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+        monkeypatch.setattr(client, "_graphql_mutation", fake_mutation)
+
+        result = client.resolve_thread(comment_id="12345", pr_number=1)
+
+        # Owner/name/number are passed as GraphQL variables
+        assert query_calls[-1][1] == {
+            "owner": "test-owner",
+            "name": "test-repo",
+            "number": 1,
         }
+        assert {key: result[key] for key in expected} == expected
+
+    @pytest.mark.parametrize(
+        "comment_id,query_response,mutation_error,error,match",
+        [
+            ("99999", _NO_THREADS, None, ValueError, "No review thread found"),
+            ("12345", _QUERY_OPEN, Exception("API error"), Exception, "Failed to resolve thread"),
+        ],
+        ids=["not_found", "mutation_fails"],
+    )
+    def test_resolve_thread_errors(
+        self, client, monkeypatch, comment_id, query_response, mutation_error, error, match,
+    ):
+        """Test errors for a missing thread and a failed mutation"""
+        fake_query, _ = fake_graphql(query_response)
+        fake_mutation, _ = fake_graphql(_MUTATION_RESOLVED, mutation_error)
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+        monkeypatch.setattr(client, "_graphql_mutation", fake_mutation)
+
+        with pytest.raises(error, match=match):
+            client.resolve_thread(comment_id=comment_id, pr_number=1)
+
+    def test_resolve_thread_clears_cache(self, client, monkeypatch):
+        """Test that resolving a thread clears its status cache"""
+        # Pre-populate cache
+        client._thread_status_cache["12345"] = CommentStatus.OPEN
 
-        with patch.object(client, "_graphql_query", return_value=query_response):
-            with pytest.raises(ValueError, match="No review thread found"):
-                client.resolve_thread(
-                    comment_id="99999",
-                    pr_number=1
-                )
+        fake_query, _ = fake_graphql(_QUERY_OPEN)
+        fake_mutation, _ = fake_graphql(_MUTATION_RESOLVED)
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+        monkeypatch.setattr(client, "_graphql_mutation", fake_mutation)
 
-    def test_resolve_thread_mutation_fails(self, client):
-        """Test error when GraphQL mutation fails"""
-        query_response = {
-            "repository": {
-                "pullRequest": {
-                    "reviewThreads": {
-                        "nodes": [
-                            {
-                                "id": "PRRT_test",
-                                "isResolved": False,
-                                "comments": {
-                                    "nodes": [{"databaseId": 12345}]
-                                }
-                            }
-                        ]
-                    }
-                }
-            }
-        }
+        client.resolve_thread(comment_id="12345", pr_number=1)
 
-        with patch.object(client, "_graphql_query", return_value=query_response):
-            with patch.object(client, "_graphql_mutation", side_effect=Exception("API error")):
-                with pytest.raises(Exception, match="Failed to resolve thread"):
-                    client.resolve_thread(
-                        comment_id="12345",
-                        pr_number=1
-                    )
+        # Cache should be cleared
+        assert "12345" not in client._thread_status_cache
 
-    def test_resolve_thread_clears_cache(self, client):
-        """Test that resolving a thread clears its status cache"""
-        # Pre-populate cache
-        client._thread_status_cache["12345"] = CommentStatus.OPEN
 
+class TestResolveThreads:
+    """Test resolve_threads() batch method"""
+
+    def test_resolve_threads_single_mutation(self, client, monkeypatch):
+        """Test that open threads are resolved with one aliased mutation"""
         query_response = {
             "repository": {
                 "pullRequest": {
                     "reviewThreads": {
                         "nodes": [
                             {
-                                "id": "PRRT_test",
+                                "id": "PRRT_open_a",
                                 "isResolved": False,
-                                "comments": {
-                                    "nodes": [{"databaseId": 12345}]
-                                }
+                                "comments": {"nodes": [{"databaseId": 111}]}
+                            },
+                            {
+                                "id": "PRRT_open_b",
+                                "isResolved": False,
+                                "comments": {"nodes": [{"databaseId": 222}, {"databaseId": 333}]}
+                            },
+                            {
+                                "id": "PRRT_done",
+                                "isResolved": True,
+                                "comments": {"nodes": [{"databaseId": 444}]}
                             }
                         ]
                     }
@@ -404,20 +496,44 @@ class TestResolveThread:
         }
 
         mutation_response = {
-            "resolveReviewThread": {
-                "thread": {
-                    "id": "PRRT_test",
-                    "isResolved": True
-                }
-            }
+            "r0": {"thread": {"id": "PRRT_open_a", "isResolved": True}},
+            "r1": {"thread": {"id": "PRRT_open_b", "isResolved": True}},
         }
 
-        with patch.object(client, "_graphql_query", return_value=query_response):
-            with patch.object(client, "_graphql_mutation", return_value=mutation_response):
-                client.resolve_thread(comment_id="12345", pr_number=1)
+        client._thread_status_cache["111"] = CommentStatus.OPEN
+
+        fake_query, _ = fake_graphql(query_response)
+        fake_mutation, mutation_calls = fake_graphql(mutation_response)
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+        monkeypatch.setattr(client, "_graphql_mutation", fake_mutation)
+
+        results = client.resolve_threads(
+            comment_ids=["111", "222", "333", "444", "999"],
+            pr_number=1
+        )
+
+        # One round-trip, one alias per unique open thread
+        assert len(mutation_calls) == 1
+        mutation, variables = mutation_calls[0]
+        assert mutation.count("resolveReviewThread") == 2
+        assert variables == {"r0": "PRRT_open_a", "r1": "PRRT_open_b"}
 
-                # Cache should be cleared
-                assert "12345" not in client._thread_status_cache
+        assert results["111"]["status"] == "resolved"
+        assert results["222"]["thread_id"] == "PRRT_open_b"
+        assert results["333"]["is_resolved"] is True
+        assert results["444"]["status"] == "already_resolved"
+        assert results["999"]["status"] == "not_found"
+        assert "111" not in client._thread_status_cache
+
+    def test_resolve_threads_mutation_fails(self, client, monkeypatch):
+        """Test error when the batched mutation fails"""
+        fake_query, _ = fake_graphql(_QUERY_OPEN)
+        fake_mutation, _ = fake_graphql(error=Exception("API error"))
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+        monkeypatch.setattr(client, "_graphql_mutation", fake_mutation)
+
+        with pytest.raises(Exception, match="Failed to resolve threads"):
+            client.resolve_threads(comment_ids=["12345"], pr_number=1)
 
 
 class TestWorkingFunctions:
@@ -454,5 +570,43 @@ class TestWorkingFunctions:
         assert content == "print('hello')"
 
 
+class TestGetFilesContent:
+    """Test get_files_content() batch method"""
+
+    def test_get_files_content_single_query(self, client, monkeypatch):
+        """Test that all files are fetched with one aliased GraphQL query"""
+        response = {
+            "repository": {
+                "f0": {"text": "print('a')\n"},
+                "f1": None,
+            }
+        }
+
+        fake_query, query_calls = fake_graphql(response)
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+
+        files = client.get_files_content(["src/a.py", "src/missing.py"], ref="feature")
+
+        assert len(query_calls) == 1
+        query, variables = query_calls[0]
+        assert query.count("object(expression:") == 2
+        assert variables == {
+            "owner": "test-owner",
+            "name": "test-repo",
+            "f0": "feature:src/a.py",
+            "f1": "feature:src/missing.py",
+        }
+
+        assert files == {"src/a.py": "print('a')\n", "src/missing.py": None}
+
+    def test_get_files_content_empty(self, client, monkeypatch):
+        """Test that no query is made when there are no files"""
+        fake_query, query_calls = fake_graphql({})
+        monkeypatch.setattr(client, "_graphql_query", fake_query)
+
+        assert client.get_files_content([], ref="main") == {}
+        assert query_calls == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,488 @@
+"""
+Unit tests for interactive workflow tools
+
+Tests prepare_comment_decisions, execute_comment_decision and
+bulk_close_comments with the underlying GitHub tools mocked out.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_server.tools import interactive
+from mcp_server.tools.interactive import (
+    bulk_close_comments,
+    bulk_close_comments_stream,
+    execute_comment_decision,
+    prepare_comment_decisions,
+)
+
+
+def _review_comment(comment_id, body, author="Copilot", status="open"):
+    """Build a review comment dict as returned by fetch_pr_comments"""
+    return {
+        "id": comment_id,
+        "comment_type": "review_comment",
+        "author": author,
+        "body": body,
+        "status": status,
+        "file_path": "src/app.py",
+        "line_number": 10,
+    }
+
+
+@pytest.fixture
+def sample_comments():
+    """Review comments covering each fast-mode classification, plus an issue comment"""
+    return [
+        _review_comment("1", "Possible SQL injection here"),
+        _review_comment("2", "This block is duplicate of the one above"),
+        _review_comment("3", "Consider moving this import to the top of the file"),
+        _review_comment("4", "Rename this variable", author="someone-else"),
+        {
+            "id": "5",
+            "comment_type": "issue_comment",
+            "author": "Copilot",
+            "body": "Overall looks good",
+            "status": "open",
+        },
+    ]
+
+
+class TestPrepareCommentDecisions:
+    """Test prepare_comment_decisions()"""
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_classification(self, sample_comments):
+        """Test fast mode keeps only comments needing a decision, in order"""
+        fetch = AsyncMock(return_value=sample_comments)
+        context = AsyncMock(return_value={"code_snippet": "ctx"})
+
+        with patch("mcp_server.tools.interactive.fetch_pr_comments", new=fetch), patch(
+            "mcp_server.tools.interactive.get_comment_context", new=context
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo", fast_mode=True)
+            )
+
+        # Only the fields fast mode uses are requested
+        assert "diff_hunk" not in fetch.await_args.kwargs["fields"]
+
+        assert result["total_comments"] == 5
+        assert result["review_comments"] == 4
+        # Security comment (confidence 0.8) doesn't need a decision
+        assert [d["comment_id"] for d in result["decisions_needed"]] == ["2", "3", "4"]
+
+        by_id = {d["comment_id"]: d for d in result["decisions_needed"]}
+        assert by_id["2"]["ai_analysis"]["status"] == "needs_fix"
+        assert by_id["3"]["ai_analysis"]["reasoning"] == "Import placement comment (fast mode)"
+        assert by_id["4"]["ai_analysis"]["confidence"] == 0.3
+        assert [q["action"] for q in by_id["2"]["suggested_questions"]] == ["fix", "dismiss", "skip"]
+
+        # Fast mode skips code context by default
+        context.assert_not_awaited()
+        assert by_id["2"]["code_context"] == "(context omitted)"
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_keyword_priority(self):
+        """Test import wording outranks duplicate and security wording"""
+        comments = [
+            _review_comment("1", "SECURITY: redundant import of os"),
+            _review_comment("2", "Redundant check, also a security smell"),
+        ]
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=comments),
+        ), patch(
+            "mcp_server.tools.interactive.get_comment_context",
+            new=AsyncMock(return_value={"code_snippet": "ctx"}),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo", fast_mode=True)
+            )
+
+        reasons = [d["ai_analysis"]["reasoning"] for d in result["decisions_needed"]]
+        assert reasons == [
+            "Import placement comment (fast mode)",
+            "Possible duplicate code (fast mode)",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_classifies_repeated_bodies_once(self):
+        """Test identical boilerplate comments share one cached classification"""
+        comments = [
+            _review_comment("1", "Consider moving this import to the top of the file"),
+            _review_comment("2", "Consider moving this IMPORT to the top of the file"),
+        ]
+        interactive._fast_classify.cache_clear()
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=comments),
+        ), patch(
+            "mcp_server.tools.interactive.get_comment_context",
+            new=AsyncMock(return_value={"code_snippet": "ctx"}),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo", fast_mode=True)
+            )
+
+        assert len(result["decisions_needed"]) == 2
+        info = interactive._fast_classify.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_filters_by_author(self, sample_comments):
+        """Test status/author filters are applied to review comments"""
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.get_comment_context",
+            new=AsyncMock(return_value={"code_snippet": "ctx"}),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(
+                    pr_number=1,
+                    repo="owner/repo",
+                    filters={"status": "open", "author": "someone-else"},
+                    fast_mode=True,
+                )
+            )
+
+        assert result["review_comments"] == 1
+        assert [d["comment_id"] for d in result["decisions_needed"]] == ["4"]
+
+    @pytest.mark.asyncio
+    async def test_analysis_error_becomes_skip_entry(self, sample_comments):
+        """Test that a failing comment is reported with a skip-only question"""
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments[:1]),
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comments_validity_batch",
+            new=AsyncMock(side_effect=Exception("batch failed")),
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comment_validity",
+            new=AsyncMock(side_effect=Exception("boom")),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo")
+            )
+
+        decision = result["decisions_needed"][0]
+        assert decision["ai_analysis"]["status"] == "error"
+        assert "boom" in decision["ai_analysis"]["reasoning"]
+        assert [q["action"] for q in decision["suggested_questions"]] == ["skip"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_analysis_becomes_skip_entry(self, sample_comments):
+        """Test that a cancelled analysis is reported like any other failure"""
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments[:1]),
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comments_validity_batch",
+            new=AsyncMock(return_value=[]),
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comment_validity",
+            new=AsyncMock(side_effect=asyncio.CancelledError()),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo")
+            )
+
+        decision = result["decisions_needed"][0]
+        assert decision["ai_analysis"]["status"] == "error"
+        assert [q["action"] for q in decision["suggested_questions"]] == ["skip"]
+
+    @pytest.mark.asyncio
+    async def test_context_prefetched_in_one_call(self, sample_comments):
+        """Test kept comments take their context from a single PR-wide fetch"""
+        prefetch = AsyncMock(
+            return_value={c["id"]: {"code_snippet": f"ctx-{c['id']}"} for c in sample_comments}
+        )
+        single = AsyncMock()
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.fetch_all_comment_contexts", new=prefetch
+        ), patch(
+            "mcp_server.tools.interactive.get_comment_context", new=single
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(
+                    pr_number=1, repo="owner/repo", fast_mode=True, include_context=True
+                )
+            )
+
+        prefetch.assert_awaited_once_with(1, "owner/repo", lines_before=5, lines_after=5)
+        single.assert_not_awaited()
+        assert [d["code_context"] for d in result["decisions_needed"]] == [
+            "ctx-2",
+            "ctx-3",
+            "ctx-4",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_context_error_becomes_skip_entry(self, sample_comments):
+        """Test a failed per-comment fallback fetch only affects its own comment"""
+
+        async def fake_context(comment_id, pr_number, repo, lines_before, lines_after):
+            if comment_id == "3":
+                raise Exception("file not found")
+            return {"code_snippet": f"ctx-{comment_id}"}
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.fetch_all_comment_contexts",
+            new=AsyncMock(side_effect=Exception("prefetch failed")),
+        ), patch(
+            "mcp_server.tools.interactive.get_comment_context", new=fake_context
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(
+                    pr_number=1, repo="owner/repo", fast_mode=True, include_context=True
+                )
+            )
+
+        decisions = result["decisions_needed"]
+        assert [d["comment_id"] for d in decisions] == ["2", "3", "4"]
+        assert decisions[0]["code_context"] == "ctx-2"
+        assert decisions[1]["ai_analysis"]["status"] == "error"
+        assert "file not found" in decisions[1]["ai_analysis"]["reasoning"]
+        assert decisions[2]["code_context"] == "ctx-4"
+
+    @pytest.mark.asyncio
+    async def test_slow_mode_uses_batch_analysis(self, sample_comments):
+        """Test slow mode analyzes all comments in one batch call"""
+        batch = AsyncMock(
+            return_value=[
+                {"comment_id": c["id"], "status": "uncertain", "confidence": 0.3}
+                for c in sample_comments[:4]
+            ]
+        )
+        single = AsyncMock()
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comments_validity_batch", new=batch
+        ), patch(
+            "mcp_server.tools.interactive.analyze_comment_validity", new=single
+        ), patch(
+            "mcp_server.tools.interactive.fetch_all_comment_contexts",
+            new=AsyncMock(
+                return_value={c["id"]: {"code_snippet": "ctx"} for c in sample_comments}
+            ),
+        ):
+            result = json.loads(
+                await prepare_comment_decisions(pr_number=1, repo="owner/repo")
+            )
+
+        batch.assert_awaited_once()
+        single.assert_not_awaited()
+        assert [d["comment_id"] for d in result["decisions_needed"]] == ["1", "2", "3", "4"]
+
+
+class TestExecuteCommentDecision:
+    """Test execute_comment_decision()"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "comment_id,action,error",
+        [
+            ("123", "close", "Invalid action: close"),
+            ("abc", "fix", "Invalid comment_id: abc"),
+        ],
+    )
+    async def test_invalid_input_makes_no_calls(self, comment_id, action, error):
+        """Test invalid input is rejected before any GitHub call, even with a message"""
+        reply = AsyncMock()
+
+        with patch("mcp_server.tools.interactive.create_comment_reply", new=reply):
+            result = json.loads(
+                await execute_comment_decision(
+                    comment_id=comment_id, pr_number=1, action=action, message="hi"
+                )
+            )
+
+        reply.assert_not_awaited()
+        assert result["action_taken"] == "error"
+        assert result["message"].startswith(error)
+
+    @pytest.mark.asyncio
+    async def test_fix_uses_default_message(self):
+        """Test fix posts the default acknowledgment and leaves the thread open"""
+        reply = AsyncMock(return_value={"id": "999"})
+        resolve = AsyncMock()
+
+        with patch(
+            "mcp_server.tools.interactive.create_comment_reply", new=reply
+        ), patch("mcp_server.tools.interactive.resolve_thread", new=resolve):
+            result = json.loads(
+                await execute_comment_decision(comment_id="123", pr_number=1, action="fix")
+            )
+
+        assert reply.await_args.kwargs["message"].startswith("✅ Acknowledged")
+        resolve.assert_not_awaited()
+        assert result["reply_id"] == "999"
+        assert result["thread_resolved"] is False
+
+
+class TestConcurrencyFromEnv:
+    """Test _concurrency_from_env()"""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(None, 10), ("4", 4), ("0", 1), ("-3", 1), ("lots", 10)],
+    )
+    def test_concurrency_from_env(self, monkeypatch, value, expected):
+        """Test that the limit is at least 1 and falls back on non-integer values"""
+        if value is None:
+            monkeypatch.delenv("MCP_BULK_CONCURRENCY", raising=False)
+        else:
+            monkeypatch.setenv("MCP_BULK_CONCURRENCY", value)
+
+        assert interactive._concurrency_from_env("MCP_BULK_CONCURRENCY", 10) == expected
+
+
+class TestBulkCloseComments:
+    """Test bulk_close_comments()"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_close_counts_results(self, sample_comments):
+        """Test that replies, resolutions and failures are counted per comment"""
+
+        async def fake_reply(comment_id, pr_number, repo, message):
+            if comment_id == "2":
+                raise ValueError("Comment 2 not found")
+            return {"id": f"reply-{comment_id}"}
+
+        async def fake_resolve(comment_id, pr_number, repo):
+            if comment_id == "3":
+                raise Exception("permission denied")
+            return {"is_resolved": True}
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.create_comment_reply", new=fake_reply
+        ), patch(
+            "mcp_server.tools.interactive.resolve_thread", new=fake_resolve
+        ):
+            result = json.loads(await bulk_close_comments(pr_number=1, repo="owner/repo"))
+
+        assert result["total_comments"] == 4
+        assert result["processed"] == 4
+        assert result["succeeded"] == 3
+        assert result["failed"] == 1
+
+        by_id = {r["comment_id"]: r for r in result["results"]}
+        assert by_id["1"]["thread_resolved"] is True
+        assert by_id["2"]["reply_posted"] is False
+        assert "not found" in by_id["2"]["error"]
+        assert by_id["3"]["success"] is True
+        assert "resolution failed" in by_id["3"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_close_bounded_concurrency(self, sample_comments):
+        """Test that no more than MCP_BULK_CONCURRENCY replies are in flight"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_reply(comment_id, pr_number, repo, message):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"id": f"reply-{comment_id}"}
+
+        with patch.object(interactive, "_BULK_CONCURRENCY", 2), patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.create_comment_reply", new=fake_reply
+        ):
+            result = json.loads(
+                await bulk_close_comments(
+                    pr_number=1, repo="owner/repo", resolve_threads=False
+                )
+            )
+
+        assert result["succeeded"] == 4
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_close_stops_at_max_failures(self, sample_comments):
+        """Test that max_failures stops new comments but reports in-flight ones"""
+        calls = []
+
+        async def reply(comment_id, pr_number, repo, message):
+            calls.append(comment_id)
+            await asyncio.sleep(0.01)
+            raise Exception("rate limited")
+
+        with patch.object(interactive, "_BULK_CONCURRENCY", 1), patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.create_comment_reply", new=reply
+        ):
+            result = json.loads(
+                await bulk_close_comments(
+                    pr_number=1, repo="owner/repo", max_failures=1
+                )
+            )
+
+        # Comment 2 had already started when comment 1 failed, so it finishes
+        # and is reported; comments 3 and 4 are never attempted
+        assert result["total_comments"] == 4
+        assert result["processed"] == 2
+        assert result["failed"] == 2
+        assert calls == ["1", "2"]
+        assert [r["comment_id"] for r in result["results"]] == ["1", "2"]
+
+
+class TestBulkCloseCommentsStream:
+    """Test bulk_close_comments_stream()"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_ndjson_in_completion_order(self, sample_comments):
+        """Test each comment is yielded as its own JSON line when it finishes"""
+
+        async def fake_reply(comment_id, pr_number, repo, message):
+            # Later comments finish first
+            await asyncio.sleep(0.01 * (5 - int(comment_id)))
+            return {"id": f"reply-{comment_id}"}
+
+        with patch(
+            "mcp_server.tools.interactive.fetch_pr_comments",
+            new=AsyncMock(return_value=sample_comments),
+        ), patch(
+            "mcp_server.tools.interactive.create_comment_reply", new=fake_reply
+        ):
+            lines = [
+                line
+                async for line in bulk_close_comments_stream(
+                    pr_number=1, repo="owner/repo", resolve_threads=False
+                )
+            ]
+
+        assert all(line.endswith("\n") for line in lines)
+        entries = [json.loads(line) for line in lines]
+        assert [e["comment_id"] for e in entries] == ["4", "3", "2", "1"]
+        assert all(e["success"] for e in entries)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
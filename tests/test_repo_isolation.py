@@ -8,16 +8,12 @@ This test suite was created to verify the fix for the bug where
 the `get_github_client()` singleton cache was ignoring the `repo` parameter.
 """
 import os
-from pathlib import Path
+from contextlib import ExitStack
 from unittest.mock import Mock, patch
 
 import pytest
 
-# Add parent directory to path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from mcp_server.tools.github_api import _clients, get_github_client
+from mcp_server.tools.github_api import _clients, _github_by_token, get_github_client
 
 
 class TestRepositoryIsolation:
@@ -27,8 +23,10 @@ class TestRepositoryIsolation:
     def clear_cache(self):
         """Clear the global client cache before each test"""
         _clients.clear()
+        _github_by_token.clear()
         yield
         _clients.clear()
+        _github_by_token.clear()
 
     def test_different_repos_get_different_clients(self):
         """Test that different repositories get separate client instances"""
@@ -66,6 +64,23 @@ class TestRepositoryIsolation:
                     # Should be the same instance (cached)
                     assert client_1 is client_2
 
+    def test_different_repos_share_github_connection(self):
+        """Test that clients for the same token share one PyGithub instance"""
+        token = "test_token_123"
+
+        with patch.dict(os.environ, {"GITHUB_TOKEN": token}):
+            with patch("mcp_server.tools.github_api.Github") as mock_github:
+                with patch("mcp_server.tools.github_api.get_repo_with_fallback") as mock_fallback:
+                    mock_fallback.side_effect = lambda provided_repo: provided_repo
+
+                    client_a = get_github_client(token=token, repo="owner-a/repo-a")
+                    client_b = get_github_client(token=token, repo="owner-b/repo-b")
+
+                    # Separate repo clients, one underlying Github connection
+                    assert client_a is not client_b
+                    assert client_a.client is client_b.client
+                    assert mock_github.call_count == 1
+
     def test_cache_isolation(self):
         """Test that thread status cache is isolated per client"""
         token = "test_token_123"
@@ -136,6 +151,15 @@ class TestRepositoryIsolation:
                     assert client_explicit is not client_auto
 
 
+@pytest.fixture(scope="class")
+def github_env_stack():
+    """Install the environment and repo fallback patches once per test class"""
+    # Github itself is patched for the whole session in conftest.py
+    with ExitStack() as stack:
+        stack.enter_context(patch.dict(os.environ, {"GITHUB_TOKEN": "test_token"}))
+        yield stack.enter_context(patch("mcp_server.tools.github_api.get_repo_with_fallback"))
+
+
 class TestToolsRespectRepoParameter:
     """Test that MCP tools correctly use the repo parameter"""
 
@@ -143,20 +167,20 @@ class TestToolsRespectRepoParameter:
     def clear_cache(self):
         """Clear the global client cache before each test"""
         _clients.clear()
+        _github_by_token.clear()
         yield
         _clients.clear()
+        _github_by_token.clear()
 
     @pytest.fixture
-    def mock_github_env(self):
+    def mock_github_env(self, github_env_stack):
         """Mock GitHub environment"""
-        with patch.dict(os.environ, {"GITHUB_TOKEN": "test_token"}):
-            with patch("mcp_server.tools.github_api.Github"):
-                with patch("mcp_server.tools.github_api.get_repo_with_fallback") as mock_fallback:
-                    def fallback_side_effect(provided_repo):
-                        return provided_repo if provided_repo else "default/repo"
+        def fallback_side_effect(provided_repo):
+            return provided_repo if provided_repo else "default/repo"
 
-                    mock_fallback.side_effect = fallback_side_effect
-                    yield mock_fallback
+        github_env_stack.side_effect = fallback_side_effect
+        yield github_env_stack
+        github_env_stack.reset_mock(side_effect=True)
 
     @pytest.mark.asyncio
     async def test_fetch_pr_comments_respects_repo(self, mock_github_env):
@@ -223,8 +247,10 @@ class TestRegressionBugScenarios:
     def clear_cache(self):
         """Clear the global client cache before each test"""
         _clients.clear()
+        _github_by_token.clear()
         yield
         _clients.clear()
+        _github_by_token.clear()
 
     def test_bug_scenario_explicit_repo_ignored(self):
         """